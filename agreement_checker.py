@@ -9,15 +9,75 @@ Agreement rules are loaded from a JSON file (no hardcoding).
 """
 
 import json
+import os
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Tuple
 
+# orjson is optional: it speeds up rule file I/O when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Small integer codes for the feature values that agreement depends on.
+# Packed together they index the precomputed agreement tables below.
+NUM_CODES = {'any': 0, 'sg': 1, 'pl': 2, 'non3sg': 3}
+PERSON_CODES = {'any': 0, '1': 1, '2': 2, '3': 3}
+VERB_POS_CODES = {'VBZ': 1, 'VBP': 2}  # Any other verb head packs as 0
+
+# These are the linguistic rules for English agreement. They can be
+# overridden by loading from a file; checkers share this read-only mapping
+# until their first load_rules call.
+DEFAULT_RULES = MappingProxyType({
+    # Rule name -> rule definition
+    "dt_nn_agreement": {
+        "description": "Determiner must agree with noun in number",
+        "constituents": ["DT", "NN"],
+        "check_type": "number_match",
+        "allow_any": True  # DT.num='any' matches anything
+    },
+    "dt_nns_agreement": {
+        "description": "Determiner must agree with plural noun",
+        "constituents": ["DT", "NNS"],
+        "check_type": "number_match",
+        "allow_any": True
+    },
+    "subject_verb_agreement_vbz": {
+        "description": "3rd person singular subject requires VBZ",
+        "constituents": ["NP", "VBZ"],
+        "check_type": "subject_verb_3sg"
+    },
+    "subject_verb_agreement_vbp": {
+        "description": "Non-3rd singular subject requires VBP",
+        "constituents": ["NP", "VBP"],
+        "check_type": "subject_verb_non3sg"
+    }
+})
+
 
 class AgreementChecker:
     """
     Checks grammatical agreements between constituents.
     """
     
+    # check_type -> (parent non-terminal the rule fires under or None for any,
+    #                name of the method that performs the check)
+    CHECK_HANDLERS = {
+        "number_match": (None, "_check_number_match"),
+        "subject_verb_3sg": ("S", "_check_subject_verb_match"),
+        "subject_verb_non3sg": ("S", "_check_subject_verb_match"),
+    }
+    
+    # Agreement outcome for every packed feature combination, shared by all
+    # instances (see _build_agreement_tables)
+    _DT_NOUN_OK = None
+    _SUBJECT_VERB_OK = None
+    
+    # Parsed rule files shared by all instances: (path, mtime) -> rules
+    _rules_file_cache = {}
+    
     def __init__(self, rules_path: str = None):
         """
         Initialize the agreement checker.
@@ -26,52 +86,125 @@ class AgreementChecker:
             rules_path: Optional path to agreement rules JSON file
         """
         self.rules = {}
+        self._dispatch = {}
+        self._verb_parents = set()
         self._load_default_rules()
         
+        if AgreementChecker._DT_NOUN_OK is None:
+            self._build_agreement_tables()
+        
         if rules_path:
             self.load_rules(rules_path)
+        else:
+            self._build_dispatch()
     
-    def _load_default_rules(self):
-        """Load default agreement rules."""
-        # These are the linguistic rules for English agreement
-        # They can be overridden by loading from a file
+    def _build_dispatch(self):
+        """
+        Precompute the (parent_nt, left_nt, right) -> handler table from the rules.
+        
+        Rules that fire under any parent are keyed with parent None and the
+        right child's non-terminal. Subject-verb rules are keyed with their
+        parent and the verb POS of the right constituent, since that is what
+        decides which check applies.
+        """
+        self._dispatch = {}
+        self._verb_parents = set()
+        
+        for rule in self.rules.values():
+            if rule.get("check_type") not in self.CHECK_HANDLERS:
+                continue
+            parent, method = self.CHECK_HANDLERS[rule["check_type"]]
+            left, right = rule["constituents"]
+            self._dispatch[(parent, left, right)] = getattr(self, method)
+            if parent is not None:
+                self._verb_parents.add(parent)
+    
+    def _build_agreement_tables(self):
+        """
+        Tabulate the DT-noun and subject-verb checks over all packed feature
+        codes, so the dispatch handlers can answer with one bytearray read.
+        
+        The tables are filled by running the reference checks below on each
+        combination, which keeps them exactly in sync with those rules.
+        """
+        dt_noun = bytearray(16)
+        for dt_num, dt_code in NUM_CODES.items():
+            for noun_num, noun_code in NUM_CODES.items():
+                ok, _ = self._check_dt_noun_agreement({'num': dt_num}, {'num': noun_num}, None)
+                dt_noun[dt_code << 2 | noun_code] = ok
+        
+        subject_verb = bytearray(128)
+        verb_heads = {0: None, **{code: pos for pos, code in VERB_POS_CODES.items()}}
+        for num, num_code in NUM_CODES.items():
+            for person, person_code in PERSON_CODES.items():
+                for verb_code, verb_pos in verb_heads.items():
+                    for past in (0, 1):
+                        ok, _ = self._check_subject_verb_agreement(
+                            {'num': num, 'person': person},
+                            {'head_pos': verb_pos, 'tense': 'past' if past else 'any'}
+                        )
+                        key = num_code | person_code << 2 | verb_code << 4 | past << 6
+                        subject_verb[key] = ok
         
-        self.rules = {
-            # Rule name -> rule definition
-            "dt_nn_agreement": {
-                "description": "Determiner must agree with noun in number",
-                "constituents": ["DT", "NN"],
-                "check_type": "number_match",
-                "allow_any": True  # DT.num='any' matches anything
-            },
-            "dt_nns_agreement": {
-                "description": "Determiner must agree with plural noun",
-                "constituents": ["DT", "NNS"],
-                "check_type": "number_match",
-                "allow_any": True
-            },
-            "subject_verb_agreement_vbz": {
-                "description": "3rd person singular subject requires VBZ",
-                "constituents": ["NP", "VBZ"],
-                "check_type": "subject_verb_3sg"
-            },
-            "subject_verb_agreement_vbp": {
-                "description": "Non-3rd singular subject requires VBP",
-                "constituents": ["NP", "VBP"],
-                "check_type": "subject_verb_non3sg"
-            }
-        }
+        AgreementChecker._DT_NOUN_OK = bytes(dt_noun)
+        AgreementChecker._SUBJECT_VERB_OK = bytes(subject_verb)
+    
+    @staticmethod
+    def _pack_dt_noun(dt_features: Dict, noun_features: Dict, noun_pos: str) -> Optional[int]:
+        """Pack DT/noun number into a table index, or None for unknown values."""
+        dt_code = NUM_CODES.get(dt_features.get('num', 'any'))
+        if noun_pos == 'NN':
+            noun_code = 1
+        elif noun_pos == 'NNS':
+            noun_code = 2
+        else:
+            noun_code = NUM_CODES.get(noun_features.get('num', 'any'))
+        if dt_code is None or noun_code is None:
+            return None
+        return dt_code << 2 | noun_code
+    
+    @staticmethod
+    def _pack_subject_verb(np_features: Dict, vp_features: Dict) -> Optional[int]:
+        """Pack subject num/person and verb head/tense into a table index, or None for unknown values."""
+        num_code = NUM_CODES.get(np_features.get('num', 'any'))
+        person_code = PERSON_CODES.get(np_features.get('person', 'any'))
+        if num_code is None or person_code is None:
+            return None
+        verb_code = VERB_POS_CODES.get(vp_features.get('head_pos') or vp_features.get('pos'), 0)
+        past = vp_features.get('tense', 'any') == 'past'
+        return num_code | person_code << 2 | verb_code << 4 | past << 6
+    
+    def _load_default_rules(self):
+        """Load default agreement rules (shared, copied on first update)."""
+        self.rules = DEFAULT_RULES
     
     def load_rules(self, filepath: str):
         """Load agreement rules from a JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.rules.update(json.load(f))
+        cache_key = (os.path.abspath(filepath), os.stat(filepath).st_mtime_ns)
+        loaded = self._rules_file_cache.get(cache_key)
+        if loaded is None:
+            if ORJSON_AVAILABLE:
+                with open(filepath, 'rb') as f:
+                    loaded = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+            self._rules_file_cache[cache_key] = loaded
+        
+        if isinstance(self.rules, MappingProxyType):
+            self.rules = dict(self.rules)  # Copy the shared defaults on first write
+        self.rules.update(loaded)
+        self._build_dispatch()
         print(f"Loaded agreement rules from {filepath}")
     
     def save_rules(self, filepath: str):
         """Save current rules to a JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.rules, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(dict(self.rules), option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(dict(self.rules), f, indent=2)
         print(f"Agreement rules saved to {filepath}")
     
     def check_agreement(self, 
@@ -94,19 +227,36 @@ class AgreementChecker:
             Tuple of (agreement_ok, error_message)
         """
         
-        # Check DT + NN agreement
-        if left_nt == 'DT' and right_nt in ('NN', 'NNS'):
-            return self._check_dt_noun_agreement(left_features, right_features, right_nt)
+        handler = self._dispatch.get((None, left_nt, right_nt))
         
-        # Check Subject-Verb agreement (when building S from NP + VP)
-        if parent_nt == 'S' and left_nt == 'NP':
-            # Get the verb type from right side
+        # Subject-Verb rules are keyed by the verb type of the right side
+        if handler is None and parent_nt in self._verb_parents:
             verb_pos = right_features.get('head_pos') or right_features.get('pos')
-            if verb_pos in ('VBZ', 'VBP'):
-                return self._check_subject_verb_agreement(left_features, right_features)
+            handler = self._dispatch.get((parent_nt, left_nt, verb_pos))
         
-        # No agreement rule applies - OK
-        return True, None
+        if handler is None:
+            # No agreement rule applies - OK
+            return True, None
+        
+        return handler(left_features, right_features, right_nt)
+    
+    def _check_number_match(self, left_features: Dict, right_features: Dict,
+                            right_nt: str) -> Tuple[bool, Optional[str]]:
+        """Dispatch target for 'number_match' rules (DT + noun)."""
+        key = self._pack_dt_noun(left_features, right_features, right_nt)
+        if key is not None and self._DT_NOUN_OK[key]:
+            return True, None
+        # Unknown feature values, or a failure that needs its error message
+        return self._check_dt_noun_agreement(left_features, right_features, right_nt)
+    
+    def _check_subject_verb_match(self, left_features: Dict, right_features: Dict,
+                                  right_nt: str) -> Tuple[bool, Optional[str]]:
+        """Dispatch target for 'subject_verb_*' rules (NP + VP)."""
+        key = self._pack_subject_verb(left_features, right_features)
+        if key is not None and self._SUBJECT_VERB_OK[key]:
+            return True, None
+        # Unknown feature values, or a failure that needs its error message
+        return self._check_subject_verb_agreement(left_features, right_features)
     
     def _check_dt_noun_agreement(self, 
                                   dt_features: Dict, 
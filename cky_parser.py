@@ -8,12 +8,158 @@ The CKY algorithm is a bottom-up chart parsing algorithm with O(n³) time comple
 where n is the length of the input sentence.
 """
 
-from collections import defaultdict
-from typing import List, Dict, Set, Tuple, Optional
+import io
+import sys
+from array import array
+from collections import defaultdict, OrderedDict
+from itertools import islice
+from typing import Iterator, List, Dict, Set, Tuple, Optional
 
+# Numba is optional: when available, the bottom-up chart fill is compiled
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-class CKYParser:
+# Shortest sentence sent to the compiled fill: below this, packing the
+# chart into arrays costs more than the specialized pure-Python fill
+COMPILED_FILL_MIN_LENGTH = 15
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _cky_fill(n, num_binary, marks, members, counts, bin_offsets, bin_flat, records):
+        """
+        Compiled bottom-up CKY fill over an integer-encoded grammar.
+        
+        Mirrors the pure-Python span loop in CKYParser.parse, visiting cell
+        members in ascending id order. Backpointers are written to `records`
+        as (cell, A, B, C, k) rows; when it is full, the kernel copies it to
+        one about twice the size and carries on. Returns the records array in
+        use and the number of rows written to it.
+        """
+        num_records = 0
+        for span_length in range(2, n + 1):
+            for i in range(n - span_length + 1):
+                j = i + span_length - 1
+                cell = i * n + j
+                for k in range(i, j):
+                    left = i * n + k
+                    right = (k + 1) * n + j
+                    for x in range(counts[left]):
+                        b = members[left, x]
+                        for y in range(counts[right]):
+                            c = members[right, y]
+                            pair = b * num_binary + c
+                            for r in range(bin_offsets[pair], bin_offsets[pair + 1]):
+                                a = bin_flat[r]
+                                if marks[cell, a] == 0:
+                                    marks[cell, a] = 1
+                                    # Keep members sorted by id, matching the
+                                    # bit order of the pure-Python fallback
+                                    pos = counts[cell]
+                                    while pos > 0 and members[cell, pos - 1] > a:
+                                        members[cell, pos] = members[cell, pos - 1]
+                                        pos -= 1
+                                    members[cell, pos] = a
+                                    counts[cell] += 1
+                                if num_records == records.shape[0]:
+                                    grown = np.empty((2 * num_records + 16, 5), dtype=records.dtype)
+                                    grown[:num_records] = records
+                                    records = grown
+                                records[num_records, 0] = cell
+                                records[num_records, 1] = a
+                                records[num_records, 2] = b
+                                records[num_records, 3] = c
+                                records[num_records, 4] = k
+                                num_records += 1
+        return records, num_records
+
+
+def _iter_bits(mask: int):
+    """Yield the positions of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        yield low.bit_length() - 1
+
+
+class BackpointerArena:
+    """
+    Append-only store for the backpointers of one parse.
+    
+    Each backpointer is a 5-int record (next, kind, arg1, arg2, arg3) in a
+    single flat array. The records of one chart item (an int key for a
+    cell/symbol pair) are chained through `next` in insertion order, starting
+    at head[item]; -1 ends a chain.
+    
+    Record kinds:
+        TERMINAL: arg1 = word position
+        NODE:     arg1 = child symbol id, arg2/arg3 = child span (unit-like node)
+        BINARY:   arg1 = left symbol id, arg2 = right symbol id, arg3 = split k
+    """
+    TERMINAL, NODE, BINARY = 0, 1, 2
+    
+    __slots__ = ('records', 'head', 'tail')
+    
     def __init__(self):
+        self.records = array('i')
+        self.head = {}
+        self.tail = {}
+    
+    def append(self, item: int, kind: int, arg1: int, arg2: int = 0, arg3: int = 0):
+        """Append a backpointer to the chain of `item`."""
+        index = len(self.records) // 5
+        self.records.extend((-1, kind, arg1, arg2, arg3))
+        tail = self.tail.get(item)
+        if tail is None:
+            self.head[item] = index
+        else:
+            self.records[tail * 5] = index
+        self.tail[item] = index
+    
+    def entries(self, item: int):
+        """Yield (kind, arg1, arg2, arg3) for each backpointer of `item`."""
+        records = self.records
+        index = self.head.get(item, -1)
+        while index != -1:
+            base = index * 5
+            yield records[base + 1], records[base + 2], records[base + 3], records[base + 4]
+            index = records[base]
+
+
+class TreeStream:
+    """
+    A lazily generated sequence of trees that can be iterated many times.
+    
+    Trees are pulled from the underlying generator only when an iterator
+    runs past what has been produced so far; later iterators replay the
+    cached prefix.
+    """
+    
+    def __init__(self, source: Iterator):
+        self._source = source
+        self._trees = []
+    
+    def __iter__(self):
+        trees = self._trees
+        index = 0
+        while True:
+            if index < len(trees):
+                yield trees[index]
+            else:
+                tree = next(self._source, None)
+                if tree is None:
+                    return
+                trees.append(tree)
+                yield tree
+            index += 1
+
+
+class CKYParser:
+    def __init__(self, max_cache_size: int = 256):
         self.grammar = {}  # Non-terminal -> list of productions
         self.terminals = set()
         self.non_terminals = set()
@@ -23,6 +169,21 @@ class CKYParser:
         self.terminal_rules = defaultdict(list)    # terminal -> [NT1, NT2, ...]
         self.binary_rules = defaultdict(list)      # (NT1, NT2) -> [A, B, ...]
         
+        # Integer encoding of the grammar (built in load_grammar)
+        self.symbols = []                          # id -> symbol
+        self.symbol_ids = {}                       # symbol -> id
+        self.terminal_rule_ids = {}                # terminal -> [A_id, ...]
+        self.binary_rule_ids = {}                  # (B_id, C_id) -> [A_id, ...]
+        self.num_binary_symbols = 0                # ids below this appear in binary rules
+        self.parents_table = []                    # B_id * num_binary_symbols + C_id -> bitset of A_ids
+        self.left_symbols = 0                      # bitset of B_ids that start a binary rule
+        self.right_symbols = 0                     # bitset of C_ids that end a binary rule
+        self.right_given_left = []                 # B_id -> bitset of C_ids with a rule A -> B C
+        
+        # LRU cache of parse results: (sentence, pos_constraints) -> (success, trees)
+        self.max_cache_size = max_cache_size
+        self._parse_cache = OrderedDict()
+        
     def load_grammar(self, grammar: dict, start_symbol: str = 'S'):
         """
         Load a CNF grammar.
@@ -47,6 +208,10 @@ class CKYParser:
         
         # Identify non-terminals and build reverse lookup tables
         self.non_terminals = set(grammar.keys())
+        self.terminals = set()
+        self.terminal_rules = defaultdict(list)
+        self.binary_rules = defaultdict(list)
+        self._parse_cache.clear()
         
         for nt, productions in grammar.items():
             for prod in productions:
@@ -60,6 +225,174 @@ class CKYParser:
                     b, c = prod[0], prod[1]
                     self.binary_rules[(b, c)].append(nt)
         
+        self._encode_grammar()
+    
+    def _encode_grammar(self):
+        """
+        Assign an integer id to every grammar symbol and re-key the rule
+        tables by id, so each chart cell can be a single int used as a
+        bitset over symbol ids instead of a set of strings.
+        
+        Symbols that appear in binary rules get the dense ids
+        0..num_binary_symbols - 1, so the pair tables grow with the
+        syntactic categories only; words of a lexicalized grammar get the
+        ids after them and are only looked up through terminal_rule_ids.
+        """
+        in_binary = set()
+        for (b, c), lhs in self.binary_rules.items():
+            in_binary.add(b)
+            in_binary.add(c)
+            in_binary.update(lhs)
+        
+        # Same order as the grammar lists its symbols (non-terminals, then
+        # terminals), binary-rule symbols first
+        ordered = dict.fromkeys(self.grammar)
+        ordered.update(dict.fromkeys(self.terminal_rules))
+        for (b, c), lhs in self.binary_rules.items():
+            ordered.update(dict.fromkeys((b, c)))
+        self.symbols = ([symbol for symbol in ordered if symbol in in_binary] +
+                        [symbol for symbol in ordered if symbol not in in_binary])
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.num_binary_symbols = num_dense = len(in_binary)
+        symbol_ids = self.symbol_ids
+        
+        # Terminals are interned so lookups of tokens that are themselves
+        # interned (most short words are) compare by identity
+        self.terminal_rule_ids = {}
+        for terminal, lhs in self.terminal_rules.items():
+            self.terminal_rule_ids[sys.intern(terminal)] = tuple(symbol_ids[a] for a in lhs)
+        
+        self.binary_rule_ids = {}
+        for (b, c), lhs in self.binary_rules.items():
+            key = (symbol_ids[b], symbol_ids[c])
+            self.binary_rule_ids[key] = tuple(sorted({symbol_ids[a] for a in lhs}))
+        
+        # Dense table of parent bitsets over the binary-rule symbols,
+        # flattened so a lookup is one multiply-add and a list index
+        parents_table = [0] * (num_dense * num_dense)
+        for (b, c), lhs in self.binary_rule_ids.items():
+            mask = 0
+            for a in lhs:
+                mask |= 1 << a
+            parents_table[b * num_dense + c] = mask
+        
+        # Which symbols can start / end a binary rule, so unproductive
+        # splits and pairs are skipped without touching parents_table
+        self.left_symbols = 0
+        self.right_symbols = 0
+        right_given_left = [0] * num_dense
+        for b, c in self.binary_rule_ids:
+            self.left_symbols |= 1 << b
+            self.right_symbols |= 1 << c
+            right_given_left[b] |= 1 << c
+        
+        # POS-constrained diagonal entries, built by _close_tag for the
+        # tags actually used rather than for every word of the grammar
+        self._tag_closure = {}
+        
+        # The tables are fixed until the next load_grammar, like the chart
+        # cells (plain ints) they are combined with
+        self.parents_table = tuple(parents_table)
+        self.right_given_left = tuple(right_given_left)
+        
+        self._specialize_fill()
+        if NUMBA_AVAILABLE:
+            self._compile_grammar_arrays()
+    
+    def _close_tag(self, tag):
+        """
+        Cache and return the POS-constrained diagonal entry of `tag`: its id,
+        its cell bitset, and the ids of the symbols deriving it (excluding
+        itself). Returns None for a tag unknown to the grammar.
+        """
+        tag_id = self.symbol_ids.get(tag)
+        if tag_id is None:
+            return None
+        mask = 1 << tag_id
+        parents = []
+        for a in self.terminal_rule_ids.get(tag, ()):
+            if not mask & (1 << a):
+                mask |= 1 << a
+                parents.append(a)
+        entry = self._tag_closure[tag] = (tag_id, mask, tuple(parents))
+        return entry
+    
+    def _specialize_fill(self):
+        """
+        Generate and compile a chart fill specialized to the loaded grammar.
+        
+        Each left symbol B gets its own function with the rules B -> ... C
+        unrolled into literal bit tests, so the pure-Python inner loop does
+        no table lookups. Right symbols and parents are visited in
+        increasing id order, which keeps the backpointer order identical to
+        the compiled path.
+        """
+        num_symbols = len(self.symbols)
+        num_dense = self.num_binary_symbols
+        lines = []
+        pairs = ['None'] * num_dense
+        
+        for b in _iter_bits(self.left_symbols):
+            lines.append(f"def _pair_{b}(right, item_base, k, append):")
+            lines.append("    bits = 0")
+            for c in _iter_bits(self.right_given_left[b]):
+                parents = self.parents_table[b * num_dense + c]
+                lines.append(f"    if right & {1 << c}:")
+                lines.append(f"        bits |= {parents}")
+                for a in _iter_bits(parents):
+                    lines.append(f"        append(item_base + {a}, {BackpointerArena.BINARY}, {b}, {c}, k)")
+            lines.append("    return bits")
+            pairs[b] = f"_pair_{b}"
+        
+        lines.append(f"_PAIRS = ({', '.join(pairs)},)")
+        lines.append(f"""
+def _fill(n, chart, append):
+    for span_length in range(2, n + 1):
+        for i in range(n - span_length + 1):
+            j = i + span_length - 1
+            cell = i * n + j
+            item_base = cell * {num_symbols}
+            cell_bits = 0
+            for k in range(i, j):
+                # Skip splits where no rule can start in the left cell
+                # or end in the right cell
+                left = chart[i * n + k] & {self.left_symbols}
+                if not left:
+                    continue
+                right = chart[(k + 1) * n + j] & {self.right_symbols}
+                if not right:
+                    continue
+                while left:
+                    low = left & -left
+                    left ^= low
+                    cell_bits |= _PAIRS[low.bit_length() - 1](right, item_base, k, append)
+            chart[cell] = cell_bits
+""")
+        
+        namespace = {}
+        exec(compile('\n'.join(lines), '<cky-fill>', 'exec'), namespace)
+        self._fill_specialized = namespace['_fill']
+    
+    def _compile_grammar_arrays(self):
+        """
+        Build CSR arrays of the binary rules for the compiled chart fill:
+        the parents of (B, C) are bin_flat[bin_offsets[p]:bin_offsets[p + 1]]
+        with p = B_id * num_binary_symbols + C_id.
+        """
+        num_dense = self.num_binary_symbols
+        offsets = np.zeros(num_dense * num_dense + 1, dtype=np.int32)
+        for (b, c), lhs in self.binary_rule_ids.items():
+            offsets[b * num_dense + c + 1] = len(lhs)
+        np.cumsum(offsets, out=offsets)
+        
+        flat = np.empty(offsets[-1], dtype=np.int32)
+        for (b, c), lhs in self.binary_rule_ids.items():
+            start = offsets[b * num_dense + c]
+            flat[start:start + len(lhs)] = lhs
+        
+        self._bin_offsets = offsets
+        self._bin_flat = flat
+        
     def load_grammar_from_converter(self, converter):
         """
         Load grammar directly from a CFGtoCNFConverter instance.
@@ -87,6 +420,65 @@ class CKYParser:
             
         Returns:
             Tuple of (success: bool, parse_trees: list or None)
+        
+        Results are cached per grammar (the cache is cleared by load_grammar),
+        so re-parsing a sentence skips the chart fill. Verbose parses bypass
+        the cache since they need the chart.
+        """
+        return self._cached_parse(sentence, pos_constraints, verbose, self.terminal_rule_ids.get)
+    
+    def parse_batch(self, sentences: List[List[str]], pos_constraints: List[List[str]] = None) -> List[Tuple[bool, Optional[List]]]:
+        """
+        Parse several sentences with the same grammar.
+        
+        The terminal rules of every distinct word in the batch are looked
+        up once, and each sentence's diagonal is filled from that table
+        (POS-constrained sentences use the per-grammar tag table instead).
+        
+        Args:
+            sentences: List of token lists
+            pos_constraints: Optional list of POS tag lists, one per sentence
+            
+        Returns:
+            List of (success, parse_trees) tuples, as returned by parse
+        """
+        if pos_constraints is None:
+            pos_constraints = [None] * len(sentences)
+        
+        table = {}
+        term_get = self.terminal_rule_ids.get
+        for sentence, tags in zip(sentences, pos_constraints):
+            if tags:
+                continue
+            for word in sentence:
+                if word not in table:
+                    table[word] = term_get(word, ())
+        
+        return [self._cached_parse(sentence, tags, False, table.get)
+                for sentence, tags in zip(sentences, pos_constraints)]
+    
+    def _cached_parse(self, sentence, pos_constraints, verbose, term_get) -> Tuple[bool, Optional[List]]:
+        """Look a parse up in the LRU cache, running _parse on a miss."""
+        key = (tuple(sentence), tuple(pos_constraints) if pos_constraints else None)
+        if not verbose and key in self._parse_cache:
+            self._parse_cache.move_to_end(key)
+            success, trees = self._parse_cache[key]
+            return success, (list(trees) if trees is not None else None)
+        
+        success, trees = self._parse(sentence, pos_constraints, verbose, term_get)
+        
+        if self.max_cache_size > 0:
+            self._parse_cache[key] = (success, tuple(trees) if trees is not None else None)
+            self._parse_cache.move_to_end(key)
+            while len(self._parse_cache) > self.max_cache_size:
+                self._parse_cache.popitem(last=False)
+        
+        return success, trees
+    
+    def _parse(self, sentence, pos_constraints, verbose, term_get) -> Tuple[bool, Optional[List]]:
+        """
+        Run the CKY algorithm itself (see parse). `term_get(token, ())`
+        returns the ids of the symbols that derive `token` in one step.
         """
         n = len(sentence)
         if n == 0:
@@ -95,105 +487,167 @@ class CKYParser:
         if pos_constraints and len(pos_constraints) != n:
             return False, None
         
-        # Initialize the chart
-        chart = [[set() for _ in range(n)] for _ in range(n)]
-        back = [[defaultdict(list) for _ in range(n)] for _ in range(n)]
+        # Initialize the chart: one int per cell, used as a bitset over
+        # symbol ids. Cell (i, j) lives at chart[i * n + j].
+        num_symbols = len(self.symbols)
+        chart = [0] * (n * n)
+        back = BackpointerArena()  # items keyed by cell * num_symbols + A_id
+        
+        def add(i, j, a, kind, arg1, arg2=0, arg3=0):
+            cell = i * n + j
+            chart[cell] |= 1 << a
+            back.append(cell * num_symbols + a, kind, arg1, arg2, arg3)
         
         # Step 1: Fill diagonal
         if pos_constraints:
-            # Manually fill with provided tags
-            for i, (word, tag) in enumerate(zip(sentence, pos_constraints)):
-                chart[i][i].add(tag)
-                back[i][i][tag].append(('terminal', word))
-                
-                # ALSO add non-terminals that derive this tag in the CNF grammar (T_ nodes)
-                for nt in self.terminal_rules.get(tag, []):
-                    if nt not in chart[i][i]:
-                        chart[i][i].add(nt)
-                        # Point to the tag node itself at the same position
-                        back[i][i][nt].append(('node', tag, i, i))
+            # Manually fill with provided tags, plus the non-terminals that
+            # derive each tag in the CNF grammar (T_ nodes)
+            tag_closure = self._tag_closure
+            append = back.append
+            terminal, node = BackpointerArena.TERMINAL, BackpointerArena.NODE
+            for i, tag in enumerate(pos_constraints):
+                entry = tag_closure.get(tag) or self._close_tag(tag)
+                if entry is None:
+                    continue  # Tag unknown to the grammar, can't combine
+                tag_id, mask, parents = entry
+                cell = i * n + i
+                chart[cell] = mask
+                item_base = cell * num_symbols
+                append(item_base + tag_id, terminal, i)
+                for a in parents:
+                    # Point to the tag node itself at the same position
+                    append(item_base + a, node, tag_id, i, i)
         else:
             # Fill using grammar terminal rules
             for i, word in enumerate(sentence):
-                for nt in self.terminal_rules.get(word, []):
-                    chart[i][i].add(nt)
-                    back[i][i][nt].append(('terminal', word))
+                for a in term_get(word, ()):
+                    add(i, i, a, BackpointerArena.TERMINAL, i)
         
         # Step 2: Fill the chart bottom-up
-        for span_length in range(2, n + 1):
-            for i in range(n - span_length + 1):
-                j = i + span_length - 1
-                for k in range(i, j):
-                    for b in chart[i][k]:
-                        for c in chart[k + 1][j]:
-                            for a in self.binary_rules.get((b, c), []):
-                                chart[i][j].add(a)
-                                back[i][j][a].append(('binary', b, c, k))
+        if NUMBA_AVAILABLE and n >= COMPILED_FILL_MIN_LENGTH:
+            self._fill_chart_compiled(n, chart, back)
+        else:
+            self._fill_specialized(n, chart, back.append)
         
         if verbose:
             self._print_chart(chart, sentence)
         
-        success = self.start_symbol in chart[0][n - 1]
+        start_id = self.symbol_ids.get(self.start_symbol)
+        success = start_id is not None and (chart[n - 1] >> start_id) & 1 == 1
         
         if success:
-            trees = self._build_trees(back, 0, n - 1, self.start_symbol, sentence)
+            trees = list(self._iter_trees(back, n, 0, n - 1, start_id, sentence))
             return True, trees
         else:
             return False, None
     
-    def _build_trees(self, back, i, j, nt, sentence, max_trees=10) -> List:
-        """Recursively build parse trees from backpointers."""
-        trees = []
+    def _fill_chart_compiled(self, n, chart, back, capacity=4096):
+        """
+        Fill the chart above the diagonal with the Numba kernel and unpack
+        its arrays back into the `chart` bitsets and the `back` arena.
+        `capacity` is the initial number of backpointer rows; the kernel
+        grows the array as needed.
+        """
+        num_symbols = len(self.symbols)
+        num_dense = self.num_binary_symbols
+        # Only symbols of binary rules can combine, so the kernel's
+        # arrays cover the dense ids alone
+        dense_mask = (1 << num_dense) - 1
+        
+        marks = np.zeros((n * n, num_dense), dtype=np.uint8)
+        members = np.zeros((n * n, num_dense), dtype=np.int32)
+        counts = np.zeros(n * n, dtype=np.int32)
+        for cell, bits in enumerate(chart):
+            bits &= dense_mask
+            if not bits:
+                continue  # Only the diagonal is filled at this point
+            ids = list(_iter_bits(bits))
+            marks[cell, ids] = 1
+            members[cell, :len(ids)] = ids
+            counts[cell] = len(ids)
+        records = np.empty((capacity, 5), dtype=np.int32)
+        
+        records, num_records = _cky_fill(n, num_dense, marks, members, counts,
+                                         self._bin_offsets, self._bin_flat, records)
+        
+        # Most cells of a long sentence stay empty, so only visit the ones
+        # the kernel actually filled
+        for cell in np.flatnonzero(counts).tolist():
+            for a in members[cell, :counts[cell]].tolist():
+                chart[cell] |= 1 << a
+        # Read the rows from one flat list of ints rather than building a
+        # list object per row
+        binary = BackpointerArena.BINARY
+        fields = iter(records[:num_records].ravel().tolist())
+        for cell, a, b, c, k in zip(fields, fields, fields, fields, fields):
+            back.append(cell * num_symbols + a, binary, b, c, k)
+    
+    def _iter_trees(self, back, n, i, j, nt, sentence, max_trees=10, memo=None) -> Iterator:
+        """
+        Lazily yield up to `max_trees` parse trees for item (i, j, nt).
+        
+        `memo` maps a chart item to a TreeStream, so a constituent shared by
+        several derivations is expanded only once per parse, and only as far
+        as some caller has actually consumed it.
+        """
+        if memo is None:
+            memo = {}
+        item = (i * n + j) * len(self.symbols) + nt
+        stream = memo.get(item)
+        if stream is None:
+            trees = self._expand_item(back, n, i, j, nt, item, sentence, max_trees, memo)
+            stream = memo[item] = TreeStream(islice(trees, max_trees))
+        return iter(stream)
+    
+    def _expand_item(self, back, n, i, j, nt, item, sentence, max_trees, memo) -> Iterator:
+        """Generate the trees of one chart item from its backpointers."""
+        label = self.symbols[nt]
         
-        for entry in back[i][j].get(nt, [])[:max_trees]:
-            if entry[0] == 'terminal':
+        for kind, arg1, arg2, arg3 in islice(back.entries(item), max_trees):
+            if kind == BackpointerArena.TERMINAL:
                 # Leaf node
-                word = entry[1]
-                trees.append((nt, word))
-            elif entry[0] == 'node':
+                yield (label, sentence[arg1])
+            elif kind == BackpointerArena.NODE:
                 # Unit-like node (e.g. T0 -> PRP)
-                _, child_nt, ci, cj = entry
-                child_trees = self._build_trees(back, ci, cj, child_nt, sentence, max_trees)
-                for child in child_trees:
-                    trees.append((nt, child))
+                for child in self._iter_trees(back, n, arg2, arg3, arg1, sentence, max_trees, memo):
+                    yield (label, child)
             else:
                 # Binary split
-                _, b, c, k = entry
-                left_trees = self._build_trees(back, i, k, b, sentence, max_trees)
-                right_trees = self._build_trees(back, k + 1, j, c, sentence, max_trees)
-                
-                for left in left_trees[:max_trees]:
-                    for right in right_trees[:max_trees]:
-                        trees.append((nt, left, right))
-                        if len(trees) >= max_trees:
-                            return trees
-        
-        return trees
+                b, c, k = arg1, arg2, arg3
+                for left in self._iter_trees(back, n, i, k, b, sentence, max_trees, memo):
+                    for right in self._iter_trees(back, n, k + 1, j, c, sentence, max_trees, memo):
+                        yield (label, left, right)
     
     def _print_chart(self, chart, sentence):
         """Print the CKY chart for debugging."""
         n = len(sentence)
-        print("\nCKY Chart:")
-        print("-" * 50)
+        # Build the whole chart in memory and emit it with a single write
+        buf = io.StringIO()
+        w = buf.write
+        w("\nCKY Chart:\n")
+        w("-" * 50 + "\n")
         
         # Print header
-        print("     ", end="")
+        w("     ")
         for i, word in enumerate(sentence):
-            print(f"{word:^12}", end="")
-        print()
+            w(f"{word:^12}")
+        w("\n")
         
+        blank = f"{'':^12}"
         for i in range(n):
-            print(f"{i:3}: ", end="")
+            w(f"{i:3}: ")
             for j in range(n):
                 if j < i:
-                    print(f"{'':^12}", end="")
+                    w(blank)
                 else:
-                    cell = chart[i][j]
+                    cell = [self.symbols[a] for a in _iter_bits(chart[i * n + j])]
                     cell_str = ",".join(sorted(cell)) if cell else "-"
                     if len(cell_str) > 10:
                         cell_str = cell_str[:9] + "…"
-                    print(f"{cell_str:^12}", end="")
-            print()
+                    w(f"{cell_str:^12}")
+            w("\n")
+        
+        sys.stdout.write(buf.getvalue())
     
     def format_tree(self, tree, indent=0) -> str:
         """Format a parse tree as a string with indentation."""
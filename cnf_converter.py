@@ -15,19 +15,96 @@ Conversion Steps:
 3. Eliminate unit productions (A → B)
 4. Replace terminals in mixed rules
 5. Break down rules with more than 2 symbols on RHS
+   (steps 4 and 5 run together in a single pass)
 """
 
 from collections import defaultdict
+from functools import lru_cache, partial
+import re
 import string
+import sys
+
+# orjson is optional: it speeds up writing the converted grammar when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Separator between alternatives in the string grammar format
+_ALT_RE = re.compile(r'\s*\|\s*')
+
+# 'ε' is always interned first, so the ε-production is (0,)
+EPSILON_ID = 0
+EPSILON = (EPSILON_ID,)
+
+
+@lru_cache(maxsize=None)
+def _subset_masks(k):
+    """
+    All bitmasks over k positions, ordered by size and then
+    lexicographically by the positions set - the order combinations() gives.
+    """
+    return tuple(sorted(range(1 << k),
+                        key=lambda mask: (bin(mask).count('1'),
+                                          [i for i in range(k) if mask >> i & 1])))
+
+
+def _add_unique(grammar, seen, non_terminal, prod):
+    """Append `prod` to grammar[non_terminal] unless it is already in `seen`."""
+    prods_seen = seen.get(non_terminal)
+    if prods_seen is None:
+        # First production of this non-terminal in the step
+        seen[non_terminal] = {prod}
+        grammar[non_terminal] = [prod]
+    elif prod not in prods_seen:
+        prods_seen.add(prod)
+        grammar[non_terminal].append(prod)
 
 
 class CFGtoCNFConverter:
+    __slots__ = ('symbols', 'symbol_ids', '_rules', '_scratch', '_decoded', '_rhs_symbols',
+                 '_is_terminal', '_is_non_terminal', 'terminals', 'non_terminals',
+                 'start_symbol', '_var_counters')
+    
     def __init__(self):
-        self.grammar = defaultdict(list)  # Non-terminal -> list of productions
+        # Symbols are interned to small ints: every production is a tuple of
+        # ids, and the conversion steps work purely on ids. `grammar`
+        # decodes the current rules back to symbol names.
+        self.symbols = []          # id -> symbol
+        self.symbol_ids = {}       # symbol -> id
+        self._rules = {}    # Non-terminal id -> list of production tuples
+        self._scratch = {}  # Reused as the next step's output grammar
+        # Views derived from the rules, rebuilt lazily after they change
+        self._decoded = None
+        self._rhs_symbols = None
+        # Membership flags indexed by symbol id, grown as symbols are interned
+        self._is_terminal = bytearray()
+        self._is_non_terminal = bytearray()
+        self._intern('ε')
         self.terminals = set()
         self.non_terminals = set()
         self.start_symbol = None
-        self.new_var_counter = 0
+        self._var_counters = {}    # Prefix -> next free numeric suffix
+    
+    @property
+    def grammar(self) -> dict:
+        """The current grammar by symbol name: non-terminal -> list of production tuples."""
+        if self._decoded is None:
+            symbols = self.symbols
+            self._decoded = {symbols[nt]: [tuple(symbols[s] for s in prod) for prod in prods]
+                             for nt, prods in self._rules.items()}
+        return self._decoded
+    
+    def _intern(self, symbol: str) -> int:
+        """Return the id of `symbol`, assigning the next free id if it is new."""
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._is_terminal.append(0)
+            self._is_non_terminal.append(0)
+        return symbol_id
         
     def parse_grammar(self, grammar_rules: dict, start_symbol: str = 'S'):
         """
@@ -51,40 +128,52 @@ class CFGtoCNFConverter:
             # For epsilon productions, use ['ε'] or ['epsilon']
             # Single terminal: [['word']]
         """
-        self.grammar = defaultdict(list)
+        self._rules = {}
+        self._invalidate()
+        self._var_counters = {}
         self.non_terminals = set()
         self.terminals = set()
+        self._is_terminal = bytearray(len(self.symbols))
+        self._is_non_terminal = bytearray(len(self.symbols))
+        intern = self._intern
         
         # First pass: collect all non-terminals (keys of the grammar)
         for non_terminal in grammar_rules.keys():
             self.non_terminals.add(non_terminal)
+            self._is_non_terminal[intern(non_terminal)] = 1
         
         # Second pass: parse productions
         for non_terminal, productions in grammar_rules.items():
+            rules = []
             for prod in productions:
                 if isinstance(prod, list):
                     # Production is already a list of symbols
                     # Handle epsilon
                     if prod == ['ε'] or prod == ['epsilon']:
-                        self.grammar[non_terminal].append(['ε'])
+                        rules.append(EPSILON)
                     else:
-                        self.grammar[non_terminal].append(prod)
+                        rules.append(tuple(intern(symbol) for symbol in prod))
                 elif isinstance(prod, str):
                     # Single symbol as string (backward compatibility)
                     if prod == 'ε' or prod.lower() == 'epsilon':
-                        self.grammar[non_terminal].append(['ε'])
+                        rules.append(EPSILON)
                     else:
-                        self.grammar[non_terminal].append([prod])
+                        rules.append((intern(prod),))
+            if rules:
+                self._rules[intern(non_terminal)] = rules
         
         # Identify terminals (symbols that are not non-terminals and not ε)
-        for non_terminal, productions in self.grammar.items():
+        is_non_terminal = self._is_non_terminal
+        for non_terminal, productions in self._rules.items():
             for prod in productions:
                 for symbol in prod:
-                    if symbol not in self.non_terminals and symbol != 'ε':
-                        self.terminals.add(symbol)
+                    if not is_non_terminal[symbol] and symbol != EPSILON_ID:
+                        self._is_terminal[symbol] = 1
+        self.terminals = {symbol for symbol, flag in zip(self.symbols, self._is_terminal) if flag}
         
         # Set start symbol
         self.start_symbol = start_symbol if start_symbol in self.non_terminals else 'S'
+        intern(self.start_symbol)
         
     def parse_grammar_from_string(self, grammar_string: str):
         """
@@ -106,16 +195,17 @@ class CFGtoCNFConverter:
         lines = grammar_string.strip().split('\n')
         
         for line in lines:
-            line = line.strip()
-            if not line or '->' not in line:
+            lhs, arrow, rhs = line.partition('->')
+            if not arrow:
                 continue
                 
-            parts = line.split('->')
-            non_terminal = parts[0].strip()
-            raw_productions = [p.strip() for p in parts[1].split('|')]
+            non_terminal = lhs.strip()
+            rhs = rhs.strip()
             
             productions = []
-            for prod in raw_productions:
+            for prod in _ALT_RE.split(rhs) if rhs else ():
+                if not prod:
+                    continue  # Empty alternative, e.g. a trailing '|'
                 if prod.lower() == 'epsilon' or prod == 'ε':
                     productions.append(['ε'])
                 else:
@@ -127,62 +217,135 @@ class CFGtoCNFConverter:
             
         self.parse_grammar(grammar_rules)
         
-    def _generate_new_variable(self, prefix='X'):
-        """Generate a new unique non-terminal variable."""
-        while True:
-            new_var = f"{prefix}{self.new_var_counter}"
-            self.new_var_counter += 1
-            if new_var not in self.non_terminals:
-                self.non_terminals.add(new_var)
-                return new_var
+    def _generate_new_variable(self, prefix='X') -> int:
+        """Generate a new unique non-terminal variable and return its id."""
+        counter = self._var_counters.get(prefix)
+        if counter is None:
+            # Start above every existing <prefix><digits> non-terminal, so
+            # generated names never collide and need no retry loop
+            counter = 1 + max((int(nt[len(prefix):]) for nt in self.non_terminals
+                               if nt.startswith(prefix) and nt[len(prefix):].isdigit()),
+                              default=-1)
+        self._var_counters[prefix] = counter + 1
+        
+        new_var = f"{prefix}{counter}"
+        self.non_terminals.add(new_var)
+        new_id = self._intern(new_var)
+        self._is_non_terminal[new_id] = 1
+        return new_id
+    
+    def _take_scratch(self):
+        """Return the cleared scratch grammar for a step to build into."""
+        self._scratch.clear()
+        return self._scratch
+    
+    def _swap_in(self, new_grammar):
+        """Make `new_grammar` current; the replaced grammar becomes the scratch."""
+        self._rules, self._scratch = new_grammar, self._rules
+        self._invalidate()
+    
+    def _invalidate(self):
+        """Drop the cached views of the rules after they change."""
+        self._decoded = None
+        self._rhs_symbols = None
+    
+    def _rhs_syms(self) -> set:
+        """The ids of all symbols used on some right-hand side (cached)."""
+        if self._rhs_symbols is None:
+            self._rhs_symbols = {symbol for prods in self._rules.values()
+                                 for prod in prods for symbol in prod}
+        return self._rhs_symbols
     
     def _start_symbol_on_rhs(self):
         """Check if the start symbol appears on the RHS of any production."""
-        for non_terminal, productions in self.grammar.items():
-            for prod in productions:
-                if self.start_symbol in prod:
-                    return True
-        return False
+        return self.symbol_ids[self.start_symbol] in self._rhs_syms()
     
-    def _step1_add_new_start_symbol(self):
+    def _step1_add_new_start_symbol(self, verbose: bool = True):
         """
         Step 1: Add a new start symbol S0 -> S
         Only if the start symbol appears on the RHS of any rule.
         """
         if self._start_symbol_on_rhs():
             new_start = self._generate_new_variable('S')
-            self.grammar[new_start] = [[self.start_symbol]]
-            self.start_symbol = new_start
-            print(f"  (S0 added because '{self.start_symbol}' appears on RHS)")
-        else:
+            self._rules[new_start] = [(self.symbol_ids[self.start_symbol],)]
+            self._invalidate()
+            self.start_symbol = self.symbols[new_start]
+            if verbose:
+                print(f"  (S0 added because '{self.start_symbol}' appears on RHS)")
+        elif verbose:
             print(f"  (S0 not needed - '{self.start_symbol}' doesn't appear on RHS)")
         
-    def _find_nullable_variables(self):
-        """Find all non-terminals that can derive ε (nullable variables)."""
-        nullable = set()
+    def _find_nullable_variables(self) -> bytearray:
+        """
+        Find all non-terminals that can derive ε (nullable variables).
+        Returns a flag per symbol id, set for the nullable ones.
+        
+        Worklist version: each production counts its symbols not yet known
+        to be nullable, and each symbol lists the productions it occurs in.
+        Marking a symbol nullable only touches those productions, so every
+        production is visited once per symbol instead of once per round.
+        """
+        nullable = bytearray(len(self.symbols))
+        watchers = defaultdict(list)  # Symbol id -> indices of productions using it
+        owners = []                   # Production index -> its non-terminal
+        remaining = []                # Production index -> symbols not yet nullable
+        queue = []
         
-        # Initial pass: find direct ε-productions
-        for non_terminal, productions in self.grammar.items():
+        for non_terminal, productions in self._rules.items():
             for prod in productions:
-                if prod == ['ε']:
-                    nullable.add(non_terminal)
-        
-        # Fixed-point iteration
-        changed = True
-        while changed:
-            changed = False
-            for non_terminal, productions in self.grammar.items():
-                if non_terminal in nullable:
+                if prod == EPSILON or not prod:
+                    # Direct ε-production
+                    if not nullable[non_terminal]:
+                        nullable[non_terminal] = 1
+                        queue.append(non_terminal)
                     continue
-                for prod in productions:
-                    # If all symbols in production are nullable
-                    if all(symbol in nullable for symbol in prod):
-                        nullable.add(non_terminal)
-                        changed = True
-                        break
+                index = len(owners)
+                owners.append(non_terminal)
+                remaining.append(len(prod))
+                for symbol in prod:
+                    watchers[symbol].append(index)
+        
+        while queue:
+            symbol = queue.pop()
+            for index in watchers.get(symbol, ()):
+                remaining[index] -= 1
+                if remaining[index] == 0:
+                    # All symbols of the production are nullable
+                    non_terminal = owners[index]
+                    if not nullable[non_terminal]:
+                        nullable[non_terminal] = 1
+                        queue.append(non_terminal)
         
         return nullable
     
+    @staticmethod
+    def _expand_nullable(prod, nullable) -> tuple:
+        """
+        All non-empty variants of `prod` with any subset of its nullable
+        symbols removed, in the order step 2 adds them.
+        """
+        # Give each nullable position its own bit; other symbols get 0
+        # and are never removed
+        position_bits = []
+        k = 0
+        for symbol in prod:
+            if nullable[symbol]:
+                position_bits.append(1 << k)
+                k += 1
+            else:
+                position_bits.append(0)
+        if not k:
+            return (prod,) if prod else ()
+        
+        # Generate all subsets of nullable positions, one bitmask each
+        variants = []
+        for mask in _subset_masks(k):
+            new_prod = tuple(symbol for symbol, bit in zip(prod, position_bits)
+                             if not mask & bit)
+            if new_prod:
+                variants.append(new_prod)
+        return tuple(variants)
+    
     def _step2_eliminate_epsilon_productions(self):
         """
         Step 2: Eliminate ε-productions.
@@ -190,178 +353,181 @@ class CFGtoCNFConverter:
         """
         nullable = self._find_nullable_variables()
         
-        new_grammar = defaultdict(list)
+        new_grammar = self._take_scratch()
+        seen = {}
+        expansions = {}  # Production -> its variants; `nullable` is fixed for this step
         
-        for non_terminal, productions in self.grammar.items():
+        for non_terminal, productions in self._rules.items():
             for prod in productions:
-                if prod == ['ε']:
+                if prod == EPSILON:
                     continue  # Skip ε-productions
                 
-                # Find all positions of nullable variables
-                nullable_positions = [i for i, symbol in enumerate(prod) if symbol in nullable]
-                
-                # Generate all subsets of nullable positions
-                from itertools import combinations
-                for r in range(len(nullable_positions) + 1):
-                    for positions_to_remove in combinations(nullable_positions, r):
-                        new_prod = [symbol for i, symbol in enumerate(prod) 
-                                   if i not in positions_to_remove]
-                        
-                        if new_prod and new_prod not in new_grammar[non_terminal]:
-                            new_grammar[non_terminal].append(new_prod)
+                variants = expansions.get(prod)
+                if variants is None:
+                    variants = expansions[prod] = self._expand_nullable(prod, nullable)
+                for new_prod in variants:
+                    _add_unique(new_grammar, seen, non_terminal, new_prod)
         
         # If start symbol is nullable, add S -> ε
-        if self.start_symbol in nullable:
-            new_grammar[self.start_symbol].append(['ε'])
+        start_id = self.symbol_ids[self.start_symbol]
+        if nullable[start_id]:
+            new_grammar.setdefault(start_id, []).append(EPSILON)
         
-        self.grammar = new_grammar
+        self._swap_in(new_grammar)
         
     def _step3_eliminate_unit_productions(self):
         """
         Step 3: Eliminate unit productions (A -> B where B is a non-terminal).
         """
-        # Find unit pairs using closure
-        unit_pairs = set()
-        
-        # Initialize with identity pairs
-        for nt in self.non_terminals:
-            unit_pairs.add((nt, nt))
-        
-        # Find direct unit productions
-        for non_terminal, productions in self.grammar.items():
-            for prod in productions:
-                if len(prod) == 1 and prod[0] in self.non_terminals:
-                    unit_pairs.add((non_terminal, prod[0]))
-        
-        # Compute closure
-        changed = True
-        while changed:
-            changed = False
-            new_pairs = set()
-            for (a, b) in unit_pairs:
-                for (c, d) in unit_pairs:
-                    if b == c and (a, d) not in unit_pairs:
-                        new_pairs.add((a, d))
-                        changed = True
-            unit_pairs.update(new_pairs)
-        
-        # Build new grammar
-        new_grammar = defaultdict(list)
-        
-        for (a, b) in unit_pairs:
-            if b in self.grammar:
-                for prod in self.grammar[b]:
-                    # Skip unit productions
-                    if not (len(prod) == 1 and prod[0] in self.non_terminals):
-                        if prod not in new_grammar[a]:
-                            new_grammar[a].append(prod)
-        
-        self.grammar = new_grammar
-        
-    def _step4_replace_terminals_in_mixed_rules(self):
+        # Direct unit successors of each non-terminal, in production order
+        is_non_terminal = self._is_non_terminal
+        unit_succ = {}
+        for non_terminal, productions in self._rules.items():
+            succ = [prod[0] for prod in productions
+                    if len(prod) == 1 and is_non_terminal[prod[0]]]
+            if succ:
+                unit_succ[non_terminal] = succ
+        
+        # Non-unit productions of each non-terminal, filtered once; those
+        # without unit productions keep their whole list
+        rules = self._rules
+        non_unit = {b: [prod for prod in rules.get(b, ())
+                        if not (len(prod) == 1 and is_non_terminal[prod[0]])]
+                    for b in unit_succ}
+        
+        # Build new grammar: each A gets the non-unit productions of every B
+        # reachable from A through unit productions (A itself included)
+        new_grammar = self._take_scratch()
+        seen = {}
+        
+        for a in rules:
+            if a not in unit_succ:
+                # No unit productions: the list is already deduplicated
+                new_grammar[a] = rules[a]
+                continue
+            reached = {a}
+            stack = [a]
+            while stack:
+                b = stack.pop()
+                prods = non_unit.get(b)
+                for prod in rules.get(b, ()) if prods is None else prods:
+                    _add_unique(new_grammar, seen, a, prod)
+                for c in reversed(unit_succ.get(b, ())):
+                    if c not in reached:
+                        reached.add(c)
+                        stack.append(c)
+        
+        self._swap_in(new_grammar)
+        
+    def _step45_replace_and_binarize(self):
         """
+        Steps 4 and 5 in a single pass over the productions.
+        
         Step 4: Replace terminals in rules with more than one symbol.
         For each terminal 'a' appearing in mixed rules, create a new rule Ta -> a.
-        """
-        terminal_vars = {}  # Maps terminal to its new non-terminal
-        new_grammar = defaultdict(list)
         
-        for non_terminal, productions in self.grammar.items():
-            for prod in productions:
-                if len(prod) == 1:
-                    # Single symbol - keep as is
-                    if prod not in new_grammar[non_terminal]:
-                        new_grammar[non_terminal].append(prod)
-                else:
-                    # Multiple symbols - replace terminals
-                    new_prod = []
-                    for symbol in prod:
-                        if symbol in self.terminals:
-                            if symbol not in terminal_vars:
-                                new_var = self._generate_new_variable('T')
-                                terminal_vars[symbol] = new_var
-                                new_grammar[new_var] = [[symbol]]
-                            new_prod.append(terminal_vars[symbol])
-                        else:
-                            new_prod.append(symbol)
-                    
-                    if new_prod not in new_grammar[non_terminal]:
-                        new_grammar[non_terminal].append(new_prod)
-        
-        self.grammar = new_grammar
-        
-    def _step5_break_long_productions(self):
-        """
         Step 5: Break down productions with more than 2 symbols on RHS.
         A -> B1 B2 B3 ... Bn becomes:
         A -> B1 C1
         C1 -> B2 C2
         ...
         Cn-2 -> Bn-1 Bn
+        where each Ci stands for the suffix Bi+1 ... Bn and is shared by all
+        productions ending in that suffix.
         """
-        new_grammar = defaultdict(list)
-        
-        for non_terminal, productions in self.grammar.items():
+        terminal_vars = {}  # Maps terminal to its new non-terminal
+        suffix_vars = {}    # Maps a chained RHS suffix to its Y variable
+        new_grammar = self._take_scratch()
+        seen = {}
+        
+        is_terminal = self._is_terminal
+        for non_terminal, productions in self._rules.items():
+            if all(len(prod) == 1 or
+                   (len(prod) == 2 and not (is_terminal[prod[0]] or is_terminal[prod[1]]))
+                   for prod in productions):
+                # Already in CNF: keep the (deduplicated) list as is
+                new_grammar[non_terminal] = productions
+                continue
             for prod in productions:
-                if len(prod) <= 2:
-                    if prod not in new_grammar[non_terminal]:
-                        new_grammar[non_terminal].append(prod)
-                else:
-                    # Break down long production
-                    current_nt = non_terminal
-                    for i in range(len(prod) - 2):
-                        new_var = self._generate_new_variable('Y')
-                        new_grammar[current_nt].append([prod[i], new_var])
-                        current_nt = new_var
-                    # Last two symbols
-                    new_grammar[current_nt].append([prod[-2], prod[-1]])
-        
-        self.grammar = new_grammar
-        
-    def convert_to_cnf(self) -> dict:
+                if len(prod) == 1:
+                    # Single symbol - keep as is
+                    _add_unique(new_grammar, seen, non_terminal, prod)
+                    continue
+                
+                # Multiple symbols - replace terminals
+                new_prod = []
+                for symbol in prod:
+                    if is_terminal[symbol]:
+                        if symbol not in terminal_vars:
+                            new_var = self._generate_new_variable('T')
+                            terminal_vars[symbol] = new_var
+                            new_grammar[new_var] = [(symbol,)]
+                            seen[new_var] = {(symbol,)}
+                        new_prod.append(terminal_vars[symbol])
+                    else:
+                        new_prod.append(symbol)
+                new_prod = tuple(new_prod)
+                
+                if len(new_prod) == 2:
+                    _add_unique(new_grammar, seen, non_terminal, new_prod)
+                    continue
+                
+                # Break down long production from the right, reusing the
+                # variable of any suffix that an earlier rule already chained
+                right = new_prod[-1]
+                for i in range(len(new_prod) - 2, 0, -1):
+                    suffix = new_prod[i:]
+                    new_var = suffix_vars.get(suffix)
+                    if new_var is None:
+                        new_var = suffix_vars[suffix] = self._generate_new_variable('Y')
+                        new_grammar[new_var] = [(new_prod[i], right)]
+                        seen[new_var] = {(new_prod[i], right)}
+                    right = new_var
+                _add_unique(new_grammar, seen, non_terminal, (new_prod[0], right))
+        
+        self._swap_in(new_grammar)
+        
+    def convert_to_cnf(self, verbose: bool = True) -> dict:
         """
         Convert the grammar to Chomsky Normal Form.
         
+        Args:
+            verbose: If True, print the grammar before and after every step
+        
         Returns:
             Dictionary representing the CNF grammar
         """
-        print("Original Grammar:")
-        self.print_grammar()
-        print()
-        
-        print("Step 1: Adding new start symbol...")
-        self._step1_add_new_start_symbol()
-        self.print_grammar()
-        print()
-        
-        print("Step 2: Eliminating ε-productions...")
-        self._step2_eliminate_epsilon_productions()
-        self.print_grammar()
-        print()
-        
-        print("Step 3: Eliminating unit productions...")
-        self._step3_eliminate_unit_productions()
-        self.print_grammar()
-        print()
-        
-        print("Step 4: Replacing terminals in mixed rules...")
-        self._step4_replace_terminals_in_mixed_rules()
-        self.print_grammar()
-        print()
-        
-        print("Step 5: Breaking long productions...")
-        self._step5_break_long_productions()
-        self.print_grammar()
-        print()
+        steps = [
+            ("Step 1: Adding new start symbol...", partial(self._step1_add_new_start_symbol, verbose)),
+            ("Step 2: Eliminating ε-productions...", self._step2_eliminate_epsilon_productions),
+            ("Step 3: Eliminating unit productions...", self._step3_eliminate_unit_productions),
+            ("Steps 4-5: Replacing terminals in mixed rules and breaking long productions...",
+             self._step45_replace_and_binarize),
+        ]
+        
+        if verbose:
+            print("Original Grammar:")
+            self.print_grammar()
+            print()
+        
+        for title, step in steps:
+            if verbose:
+                print(title)
+            step()
+            if verbose:
+                self.print_grammar()
+                print()
         
         return dict(self.grammar)
     
     def print_grammar(self):
         """Print the current grammar in a readable format."""
-        for non_terminal in sorted(self.grammar.keys()):
-            productions = self.grammar[non_terminal]
-            prod_strs = [' '.join(prod) for prod in productions]
-            print(f"  {non_terminal} -> {' | '.join(prod_strs)}")
+        grammar = self.grammar
+        lines = []
+        for non_terminal in sorted(grammar.keys()):
+            prod_strs = [' '.join(prod) for prod in grammar[non_terminal]]
+            lines.append(f"  {non_terminal} -> {' | '.join(prod_strs)}\n")
+        sys.stdout.write(''.join(lines))
             
     def get_cnf_grammar(self) -> dict:
         """Return the current grammar as a dictionary."""
@@ -370,24 +536,26 @@ class CFGtoCNFConverter:
     
     def is_valid_cnf(self) -> bool:
         """Check if the current grammar is in valid CNF."""
-        for non_terminal, productions in self.grammar.items():
+        start_id = self.symbol_ids[self.start_symbol]
+        is_terminal = self._is_terminal
+        is_non_terminal = self._is_non_terminal
+        start_on_rhs = self._start_symbol_on_rhs()
+        for non_terminal, productions in self._rules.items():
             for prod in productions:
                 # Check for ε production (only allowed for start symbol)
-                if prod == ['ε']:
-                    if non_terminal != self.start_symbol:
+                if prod == EPSILON:
+                    if non_terminal != start_id:
                         return False
                     # Check start symbol doesn't appear on RHS
-                    for nt, prods in self.grammar.items():
-                        for p in prods:
-                            if self.start_symbol in p:
-                                return False
+                    if start_on_rhs:
+                        return False
                 # Check for single terminal
                 elif len(prod) == 1:
-                    if prod[0] not in self.terminals:
+                    if not is_terminal[prod[0]]:
                         return False
                 # Check for two non-terminals
                 elif len(prod) == 2:
-                    if prod[0] not in self.non_terminals or prod[1] not in self.non_terminals:
+                    if not (is_non_terminal[prod[0]] and is_non_terminal[prod[1]]):
                         return False
                 else:
                     return False
@@ -529,42 +697,33 @@ if __name__ == "__main__":
     print(f"Start symbol: {start_symbol}")
     print(f"Original rules: {sum(len(prods) for prods in original_grammar.values())}")
     
-    # Convert to CNF
+    # Convert to CNF; --quiet skips printing the grammar after every step
+    quiet = '--quiet' in sys.argv[1:]
     converter = CFGtoCNFConverter()
     converter.parse_grammar(original_grammar, start_symbol)
-    cnf_grammar = converter.convert_to_cnf()
+    cnf_grammar = converter.convert_to_cnf(verbose=not quiet)
     
-    # Deduplicate CNF rules
-    print("\n" + "=" * 60)
-    print("Deduplicating CNF rules...")
-    print("=" * 60)
-    
-    deduplicated = {}
-    total_removed = 0
-    for nt, prods in cnf_grammar.items():
-        seen = set()
-        unique_prods = []
-        for prod in prods:
-            prod_tuple = tuple(prod)
-            if prod_tuple not in seen:
-                seen.add(prod_tuple)
-                unique_prods.append(prod)
-            else:
-                total_removed += 1
-        deduplicated[nt] = unique_prods
-    
-    print(f"Removed {total_removed} duplicate rules")
-    print(f"Final CNF rules: {sum(len(prods) for prods in deduplicated.values())}")
+    # Every conversion step already drops duplicate productions
+    print(f"\nFinal CNF rules: {sum(len(prods) for prods in cnf_grammar.values())}")
     
     # Save CNF grammar
     cnf_data = {
         'start_symbol': converter.start_symbol,
-        'rules': deduplicated,
+        'rules': cnf_grammar,
         'is_cnf': True
     }
     
-    with open(output_file, 'w') as f:
-        json.dump(cnf_data, f, indent=2)
+    # Compact output by default; --pretty keeps the indented layout
+    pretty = '--pretty' in sys.argv[1:]
+    if ORJSON_AVAILABLE:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(cnf_data, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(cnf_data, f, indent=2)
+            else:
+                json.dump(cnf_data, f, separators=(',', ':'), ensure_ascii=False)
     
     print(f"\nCNF Grammar saved to {output_file}")
     print("=" * 60)
@@ -11,9 +11,57 @@ The grammar uses only Penn Treebank POS tags and is designed to work
 with the CKY parser and CNF converter.
 """
 
+import hashlib
+import importlib.util
 import json
+import sys
+from collections import defaultdict
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Tuple, Any
+
+# orjson is optional: it speeds up grammar file I/O when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _read_json(filepath: str) -> Any:
+    """Read a JSON file, with orjson when it is available."""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _file_hash(filepath) -> str:
+    """Hash of a file's contents."""
+    with open(filepath, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _import_grammar_module(filepath: Path) -> Tuple[str, Dict[str, Any], Any]:
+    """
+    Import a module written by EnglishCFG.save_grammar_module.
+    
+    Returns (start symbol, rules, hash of the JSON file it was saved from).
+    """
+    spec = importlib.util.spec_from_file_location(f"_compiled_{filepath.stem}", filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.START_SYMBOL, module.RULES, getattr(module, 'SOURCE_HASH', None)
+
+
+# Verb tags that share most VP patterns
+VERB_TAGS = ('VB', 'VBD', 'VBP', 'VBZ')
+
+
+def _with_heads(heads, *tail) -> List[List[str]]:
+    """One production [head, *tail] for each head, in order."""
+    return [[head, *tail] for head in heads]
 
 
 class EnglishCFG:
@@ -55,10 +103,22 @@ class EnglishCFG:
     - UH: Interjection
     """
     
-    def __init__(self):
-        self.grammar = {}
-        self.start_symbol = 'S'
-        self._build_grammar()
+    def __init__(self, grammar: Dict[str, List[List[str]]] = None, start_symbol: str = 'S'):
+        """
+        Args:
+            grammar: Prebuilt grammar rules (e.g. loaded from JSON); when
+                     omitted the built-in grammar is constructed
+            start_symbol: The start symbol of the grammar
+        """
+        self.start_symbol = start_symbol
+        self.binary_index = None  # (B, C) -> non-terminals with a rule A -> B C
+        self.unary_index = None   # B -> non-terminals with a rule A -> B
+        self._stats = None        # Cached (counts, terminal set) for get_stats
+        if grammar is None:
+            self.grammar = {}
+            self._build_grammar()
+        else:
+            self.grammar = grammar
     
     def _build_grammar(self):
         """Build the complete CFG grammar."""
@@ -190,15 +250,10 @@ class EnglishCFG:
             ['CD', 'JJ', 'NNS'],    # "two historical novels"
             ['DT', 'CD', 'NNS'],    # "the two books"
             
-            # Bare adjective + noun (no determiner)
-            ['JJ', 'NN'],           # "historical novel"
-            ['JJ', 'NNS'],          # "historical novels"
-            ['RB', 'JJ', 'NN'],     # "very big book"
-            ['RB', 'JJ', 'NNS'],
+            # Bare comparative/superlative + singular noun
+            # (the other bare adjective forms are listed above)
             ['JJR', 'NN'],
-            ['JJR', 'NNS'],
             ['JJS', 'NN'],
-            ['JJS', 'NNS'],
             ['RBS', 'JJ', 'NN'],
             
             # Comparative with 'than'
@@ -226,55 +281,33 @@ class EnglishCFG:
         ]
         
         # VP: Verb Phrase
+        # Patterns shared by several verb tags are expanded by _with_heads,
+        # one production per tag in the order listed
         self.grammar['VP'] = [
-            # Intransitive verbs
-            ['VB'],                 # "run" (imperative)
-            ['VBD'],                # "arrived"
-            ['VBP'],                # "run" (non-3sg present)
-            ['VBZ'],                # "runs" (3sg present)
-            ['VBG'],                # "running"
-            
-            # Transitive verbs with NP object
-            ['VB', 'NP'],           # "buy a book"
-            ['VBD', 'NP'],          # "bought a book"
-            ['VBP', 'NP'],          # "buy books"
-            ['VBZ', 'NP'],          # "buys a book"
-            ['VBG', 'NP'],          # "buying a book"
-            ['VBN', 'NP'],          # "bought a book" (passive)
-            
-            # Ditransitive verbs (two objects)
-            ['VB', 'NP', 'NP'],     # "give him a book"
-            ['VBD', 'NP', 'NP'],    # "gave him a book"
-            ['VBP', 'NP', 'NP'],    # "give him a book"
-            ['VBZ', 'NP', 'NP'],    # "gives him a book"
-            
-            # Verb + PP
-            ['VB', 'PP'],           # "go to the store"
-            ['VBD', 'PP'],          # "went to the store"
-            ['VBP', 'PP'],          # "go to the store"
-            ['VBZ', 'PP'],          # "goes to the store"
-            
-            # Verb + NP + PP
-            ['VB', 'NP', 'PP'],     # "buy a book for me"
-            ['VBD', 'NP', 'PP'],    # "bought a book for me"
-            ['VBP', 'NP', 'PP'],    # "buy a book for me"
-            ['VBZ', 'NP', 'PP'],    # "buys a book for me"
-            
-            # Verb + adverb
-            ['VB', 'RB'],           # "run quickly"
-            ['VBD', 'RB'],          # "ran quickly"
-            ['VBP', 'RB'],          # "run quickly"
-            ['VBZ', 'RB'],          # "runs quickly"
-            ['VB', 'RB', 'RB'],     # "run very quickly"
-            ['VBD', 'RB', 'RB'],
-            ['VBZ', 'RB', 'RB'],
-            ['VB', 'RBR'],          # "run faster"
+            # Intransitive verbs: "run", "arrived", "runs", "running"
+            *_with_heads(VERB_TAGS + ('VBG',)),
+            
+            # Transitive verbs with NP object: "buy a book", "buying a book",
+            # "bought a book" (passive, VBN)
+            *_with_heads(VERB_TAGS + ('VBG', 'VBN'), 'NP'),
+            
+            # Ditransitive verbs (two objects): "give him a book"
+            *_with_heads(VERB_TAGS, 'NP', 'NP'),
+            
+            # Verb + PP: "go to the store"
+            *_with_heads(VERB_TAGS, 'PP'),
+            
+            # Verb + NP + PP: "buy a book for me"
+            *_with_heads(VERB_TAGS, 'NP', 'PP'),
+            
+            # Verb + adverb: "run quickly", "run very quickly", "run faster"
+            *_with_heads(VERB_TAGS, 'RB'),
+            *_with_heads(('VB', 'VBD', 'VBZ'), 'RB', 'RB'),
+            ['VB', 'RBR'],
             ['VB', 'RBS'],
             
-            # Verb + NP + adverb
-            ['VBD', 'NP', 'RB'],    # "bought a book yesterday"
-            ['VBP', 'NP', 'RB'],    # "buy a book today"
-            ['VBZ', 'NP', 'RB'],    # "buys a book daily"
+            # Verb + NP + adverb: "bought a book yesterday"
+            *_with_heads(('VBD', 'VBP', 'VBZ'), 'NP', 'RB'),
             
             # Modal + verb
             ['MD', 'VB'],           # "will go"
@@ -286,36 +319,19 @@ class EnglishCFG:
             ['MD', 'VB', 'VBN', 'NP'],   # "could have done it"
             ['MD', 'VB', 'VBN'],         # "could have gone"
             
-            # Auxiliary constructions
-            ['VBZ', 'VBG'],         # "is running"
-            ['VBP', 'VBG'],
-            ['VBD', 'VBG'],
-            ['MD', 'VBG'],
-            ['VBZ', 'VBG', 'NP'],   # "is buying a book"
-            ['VBP', 'VBG', 'NP'],
-            ['VBD', 'VBG', 'NP'],
-            ['VBZ', 'VBN'],         # "was bought" (passive)
-            ['VBP', 'VBN'],
-            #['VBD', 'VBN'],
-            ['VBZ', 'VBN', 'PP'],   # "was bought by me"
-            ['VBP', 'VBN', 'PP'],
-            ['VBD', 'VBN', 'PP'],
-            
-            # Negation
-            ['VBZ', 'RB', 'VP'],    # "does n't like pizza"
-            ['VBP', 'RB', 'VP'],    # "do n't want anything"
-            ['MD', 'RB', 'VP'],     # "can't go"
-            ['VBD', 'RB', 'VP'],    # "did n't go"
-            
-            # To-infinitive
-            ['VB', 'TO', 'VB'],     # "want to go"
-            ['VBD', 'TO', 'VB'],    # "wanted to go"
-            ['VBP', 'TO', 'VB'],    # "want to go"
-            ['VBZ', 'TO', 'VB'],    # "wants to go"
-            ['VB', 'TO', 'VB', 'NP'],   # "want to buy a book"
-            ['VBD', 'TO', 'VB', 'NP'],  # "wanted to buy a book"
-            ['VBP', 'TO', 'VB', 'NP'],  # "want to buy a book"
-            ['VBZ', 'TO', 'VB', 'NP'],  # "wants to buy a book"
+            # Auxiliary constructions: "is running", "is buying a book",
+            # "was bought" (passive), "was bought by me"
+            *_with_heads(('VBZ', 'VBP', 'VBD', 'MD'), 'VBG'),
+            *_with_heads(('VBZ', 'VBP', 'VBD'), 'VBG', 'NP'),
+            *_with_heads(('VBZ', 'VBP'), 'VBN'),    # not VBD VBN
+            *_with_heads(('VBZ', 'VBP', 'VBD'), 'VBN', 'PP'),
+            
+            # Negation: "does n't like pizza", "can't go", "did n't go"
+            *_with_heads(('VBZ', 'VBP', 'MD', 'VBD'), 'RB', 'VP'),
+            
+            # To-infinitive: "want to go", "wants to buy a book"
+            *_with_heads(VERB_TAGS, 'TO', 'VB'),
+            *_with_heads(VERB_TAGS, 'TO', 'VB', 'NP'),
             
             # Verb + adjective (linking verb)
             ['VBZ', 'JJ'],          # "is happy"
@@ -327,13 +343,9 @@ class EnglishCFG:
             ['VBD', 'JJ'],          # "was happy"
             ['VBD', 'RB', 'JJ'],
             
-            # Verb + particle (phrasal verbs)
-            ['VB', 'RP'],           # "give up"
-            ['VBD', 'RP'],          # "gave up"
-            ['VBP', 'RP'],          # "give up"
-            ['VBZ', 'RP'],          # "gives up"
-            ['VB', 'RP', 'NP'],     # "pick up the book"
-            ['VBD', 'RP', 'NP'],    # "picked up the book"
+            # Verb + particle (phrasal verbs): "give up", "pick up the book"
+            *_with_heads(VERB_TAGS, 'RP'),
+            *_with_heads(('VB', 'VBD'), 'RP', 'NP'),
             
             
             # Copular verb + adverb phrase + PP (was quite far from)
@@ -349,12 +361,10 @@ class EnglishCFG:
             ['VBP', 'JJ', 'NP'],    # "are the best students"
             ['VBD', 'JJ', 'NP'],    # "was a happy child"
             
-            # Verb + ADJP + NP (enjoy historical novels)
+            # Verb + ADJP + NP (enjoy historical novels); the VBP/VBD/VBZ
+            # forms are covered by the copular rules above
             ['VB', 'JJ', 'NP'],     # "enjoy historical novels"
             ['VB', 'RB', 'JJ', 'NP'],
-            ['VBP', 'JJ', 'NP'],    # "enjoy historical novels"
-            ['VBD', 'JJ', 'NP'],    # "enjoyed historical novels"
-            ['VBZ', 'JJ', 'NP'],    # "enjoys historical novels"
             
             # Copular verb + ADJP + infinitive complement (was too cold to eat)
             ['VBD', 'JJ', 'PP'],    # "was too cold to eat"
@@ -383,6 +393,67 @@ class EnglishCFG:
         """Return the grammar rules."""
         return self.grammar
     
+    def get_grammar_ids(self) -> Tuple[Dict[str, int], Dict[int, Tuple[Tuple[int, ...], ...]]]:
+        """
+        Return the grammar with every symbol replaced by a small integer id.
+        
+        Non-terminals are numbered first, so `symbol_id < len(self.grammar)`
+        tells non-terminals from POS tags. Productions become tuples of ids.
+        
+        Returns:
+            Tuple of (symbol -> id table, non-terminal id -> productions)
+        """
+        symbol_ids = {nt: i for i, nt in enumerate(self.grammar)}
+        for prods in self.grammar.values():
+            for prod in prods:
+                for symbol in prod:
+                    if symbol not in symbol_ids:
+                        symbol_ids[symbol] = len(symbol_ids)
+        
+        rules = {symbol_ids[nt]: tuple(tuple(symbol_ids[symbol] for symbol in prod) for prod in prods)
+                 for nt, prods in self.grammar.items()}
+        return symbol_ids, rules
+    
+    def invalidate_caches(self):
+        """
+        Drop the cached indices and statistics.
+        
+        Call after editing `grammar` directly; the methods here that change
+        the grammar do it themselves.
+        """
+        self.binary_index = self.unary_index = None
+        self._stats = None
+    
+    def build_indices(self):
+        """
+        Index the productions by their right-hand side.
+        
+        Fills `binary_index` ((B, C) -> [A, ...] for rules A -> B C) and
+        `unary_index` (B -> [A, ...] for rules A -> B), so a chart parser can
+        look up the rules for a pair of symbols instead of scanning the grammar.
+        Built on first use by iter_binary; see invalidate_caches.
+        """
+        binary_index = defaultdict(list)
+        unary_index = defaultdict(list)
+        for nt, prods in self.grammar.items():
+            for prod in prods:
+                if len(prod) == 2:
+                    lhs = binary_index[(prod[0], prod[1])]
+                elif len(prod) == 1:
+                    lhs = unary_index[prod[0]]
+                else:
+                    continue
+                if nt not in lhs:
+                    lhs.append(nt)
+        self.binary_index = dict(binary_index)
+        self.unary_index = dict(unary_index)
+    
+    def iter_binary(self, b: str, c: str) -> List[str]:
+        """Return the non-terminals A with a rule A -> b c."""
+        if self.binary_index is None:
+            self.build_indices()
+        return self.binary_index.get((b, c), [])
+    
     def get_start_symbol(self) -> str:
         """Return the start symbol."""
         return self.start_symbol
@@ -405,6 +476,7 @@ class EnglishCFG:
             deduplicated[nt] = unique_prods
         
         self.grammar = deduplicated
+        self.invalidate_caches()
         if total_removed > 0:
             print(f"Removed {total_removed} duplicate rules")
         return total_removed
@@ -418,94 +490,181 @@ class EnglishCFG:
             'start_symbol': self.start_symbol,
             'rules': self.grammar
         }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
         print(f"Grammar saved to {filepath}")
     
+    def save_grammar_module(self, filepath: str, source_path: str):
+        """
+        Save grammar as a Python module defining START_SYMBOL and RULES.
+        
+        Importing the module goes through Python's cached bytecode, which is
+        faster than parsing the JSON. load_grammar uses it when it sits next
+        to the JSON file (same name, .py suffix) and the JSON still has the
+        hash recorded in the module.
+        
+        Args:
+            filepath: Path of the module to write
+            source_path: The JSON file written by save_grammar for this grammar
+        """
+        lines = ['"""English CFG grammar generated by english_cfg.py - do not edit."""', '',
+                 f"SOURCE_HASH = {_file_hash(source_path)!r}", '',
+                 f"START_SYMBOL = {self.start_symbol!r}", '', "RULES = {"]
+        for nt, prods in self.grammar.items():
+            lines.append(f"    {nt!r}: {tuple(tuple(prod) for prod in prods)!r},")
+        lines.append("}")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        print(f"Grammar module saved to {filepath}")
+    
     @classmethod
     def load_grammar(cls, filepath: str) -> 'EnglishCFG':
-        """Load grammar from a JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        cfg = cls()
-        cfg.grammar = data['rules']
-        cfg.start_symbol = data['start_symbol']
-        print(f"Grammar loaded from {filepath}")
+        """
+        Load grammar from a JSON file.
+        
+        A module written by save_grammar_module next to the file is imported
+        instead, as long as it was saved from the JSON file's current contents.
+        """
+        json_path = Path(filepath)
+        module_path = json_path.with_suffix('.py')
+        saved_rules = None
+        if module_path.exists():
+            start_symbol, saved_rules, source_hash = _import_grammar_module(module_path)
+            source = module_path
+            if json_path.exists() and source_hash != _file_hash(json_path):
+                saved_rules = None  # JSON edited or replaced since: stale module
+        if saved_rules is None:
+            data = _read_json(filepath)
+            start_symbol, saved_rules = data['start_symbol'], data['rules']
+            source = filepath
+        
+        # Intern the symbols: JSON gives every occurrence of a tag its own
+        # string, while interned ones hash once and compare by identity.
+        # Productions become lists again, as the converters expect.
+        intern = sys.intern
+        rules = {intern(nt): [[intern(symbol) for symbol in prod] for prod in prods]
+                 for nt, prods in saved_rules.items()}
+        
+        # The saved rules replace the built-in ones, so skip building them
+        cfg = cls(rules, intern(start_symbol))
+        print(f"Grammar loaded from {source}")
         return cfg
     
+    def grammar_hash(self) -> str:
+        """
+        Hash of the start symbol and the rules, in order.
+        
+        Computed afresh on every call (it takes well under a millisecond),
+        so edits made directly to `grammar` are always reflected.
+        """
+        canonical = repr((self.start_symbol,
+                          [(nt, [tuple(prod) for prod in prods]) for nt, prods in self.grammar.items()]))
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def to_cnf(self, verbose: bool = False):
+        """
+        Convert the grammar to CNF.
+        
+        The converter reads the rule lists in place and encodes them into its
+        own id tuples, so no intermediate copy of the grammar is made.
+        
+        Conversion runs in this process: the steps depend on the whole
+        grammar (nullable and unit closures, shared T/Y variables), and for
+        this grammar it takes about a millisecond, far less than starting
+        worker processes would.
+        
+        Returns:
+            The CFGtoCNFConverter holding the converted grammar
+        """
+        from cnf_converter import CFGtoCNFConverter
+        
+        converter = CFGtoCNFConverter()
+        converter.parse_grammar(self.grammar, self.start_symbol)
+        converter.convert_to_cnf(verbose=verbose)
+        return converter
+    
     def save_cnf_grammar(self, filepath: str):
-        """Convert grammar to CNF and save to a file."""
-        from cnf_converter import CNFConverter
+        """
+        Convert grammar to CNF and save to a file.
         
-        # Convert to CNF
-        converter = CNFConverter(self.grammar, self.start_symbol)
-        cnf_grammar = converter.convert_to_cnf()
+        The file records the hash of the grammar it was converted from and of
+        the converter's source; if it already holds the conversion of this
+        grammar by this converter, it is left as is.
+        """
+        import cnf_converter
         
-        # Deduplicate CNF rules
-        deduplicated = {}
-        total_removed = 0
-        for nt, prods in cnf_grammar.items():
-            seen = set()
-            unique_prods = []
-            for prod in prods:
-                prod_tuple = tuple(prod)
-                if prod_tuple not in seen:
-                    seen.add(prod_tuple)
-                    unique_prods.append(prod)
-                else:
-                    total_removed += 1
-            deduplicated[nt] = unique_prods
+        grammar_hash = self.grammar_hash()
+        converter_hash = _file_hash(cnf_converter.__file__)
+        try:
+            saved = _read_json(filepath)
+            if (saved.get('grammar_hash') == grammar_hash and
+                    saved.get('converter_hash') == converter_hash):
+                print(f"CNF Grammar in {filepath} is up to date")
+                return
+        except (OSError, ValueError, AttributeError):
+            pass  # Missing or unreadable: convert and overwrite
         
-        if total_removed > 0:
-            print(f"Removed {total_removed} duplicate CNF rules")
+        # Convert to CNF; every conversion step already drops duplicate productions
+        converter = self.to_cnf()
         
         # Save
         data = {
             'start_symbol': converter.start_symbol,
-            'rules': deduplicated,
-            'is_cnf': True
+            'rules': converter.grammar,
+            'is_cnf': True,
+            'grammar_hash': grammar_hash,
+            'converter_hash': converter_hash
         }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        # The CNF file is only read by programs, so write it compactly
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
         print(f"CNF Grammar saved to {filepath}")
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get statistics about the grammar."""
-        total_rules = sum(len(prods) for prods in self.grammar.values())
-        non_terminals = list(self.grammar.keys())
-        
-        # Count terminals (POS tags that don't have productions)
-        all_symbols = set()
-        for prods in self.grammar.values():
-            for prod in prods:
-                all_symbols.update(prod)
+    def get_stats(self, detail: bool = False) -> Dict[str, Any]:
+        """
+        Get statistics about the grammar (computed once, see invalidate_caches).
         
-        terminals = all_symbols - set(non_terminals)
+        Args:
+            detail: Also include the non-terminal list and the sorted
+                    terminal list (skipped by default; only counts)
+        """
+        if self._stats is None:
+            # Count terminals (POS tags that don't have productions)
+            all_symbols = set(chain.from_iterable(chain.from_iterable(self.grammar.values())))
+            terminals = all_symbols.difference(self.grammar)
+            counts = {
+                'start_symbol': self.start_symbol,
+                'non_terminals': len(self.grammar),
+                'terminals': len(terminals),
+                'total_rules': sum(map(len, self.grammar.values()))
+            }
+            self._stats = (counts, terminals)
+        counts, terminals = self._stats
         
-        return {
-            'start_symbol': self.start_symbol,
-            'non_terminals': len(non_terminals),
-            'terminals': len(terminals),
-            'total_rules': total_rules,
-            'non_terminal_list': non_terminals,
-            'terminal_list': sorted(terminals)
-        }
+        stats = dict(counts)
+        if detail:
+            stats['non_terminal_list'] = list(self.grammar.keys())
+            stats['terminal_list'] = sorted(terminals)
+        return stats
     
     def print_grammar(self):
         """Print the grammar in a readable format."""
-        print("=" * 60)
-        print("English CFG Grammar")
-        print("=" * 60)
-        print(f"Start symbol: {self.start_symbol}")
-        print()
+        lines = ["=" * 60, "English CFG Grammar", "=" * 60,
+                 f"Start symbol: {self.start_symbol}", ""]
         
         for nt, prods in self.grammar.items():
-            prod_strs = [' '.join(p) for p in prods]
-            print(f"{nt} →")
-            for ps in prod_strs:
-                print(f"    | {ps}")
-            print()
+            lines.append(f"{nt} →")
+            lines.extend(f"    | {' '.join(p)}" for p in prods)
+            lines.append("")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():
@@ -515,7 +674,7 @@ def main():
     cfg = EnglishCFG()
     
     # Print statistics
-    stats = cfg.get_stats()
+    stats = cfg.get_stats(detail=True)
     print("=" * 60)
     print("English CFG - Penn Treebank Tags")
     print("=" * 60)
@@ -534,19 +693,18 @@ def main():
     script_dir = Path(__file__).parent
     output_file = script_dir / "data" / "english_grammar.json"
     cfg.save_grammar(str(output_file))
+    cfg.save_grammar_module(str(output_file.with_suffix('.py')), str(output_file))
     
     # Print some example rules
-    print("=" * 60)
-    print("Sample Rules:")
-    print("=" * 60)
+    lines = ["=" * 60, "Sample Rules:", "=" * 60]
     
     for nt in ['S', 'NP', 'VP', 'PP']:
         prods = cfg.grammar[nt][:5]  # First 5 rules
-        print(f"\n{nt} →")
-        for p in prods:
-            print(f"    | {' '.join(p)}")
+        lines.append(f"\n{nt} →")
+        lines.extend(f"    | {' '.join(p)}" for p in prods)
         if len(cfg.grammar[nt]) > 5:
-            print(f"    | ... ({len(cfg.grammar[nt]) - 5} more)")
+            lines.append(f"    | ... ({len(cfg.grammar[nt]) - 5} more)")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 if __name__ == "__main__":
@@ -6,21 +6,28 @@ Runs all prerequisite scripts to generate required data files
 before the main parser can be used.
 
 Usage:
-    python initialize.py           # Generate all data files
-    python initialize.py --run     # Generate files and run parser
+    python initialize.py                # Generate all data files
+    python initialize.py --run          # Generate files and run parser
+    python initialize.py --subprocess   # Run each step in its own interpreter
 """
 
+import importlib
 import subprocess
 import sys
 import os
+import traceback
 from pathlib import Path
 
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent.absolute()
 
 
-def run_script(script_name: str, description: str) -> bool:
-    """Run a Python script and return success status."""
+def run_script(script_name: str, description: str, capture: bool = False) -> bool:
+    """
+    Run a Python script and return success status.
+    
+    With `capture`, the script's output is collected and only shown if it fails.
+    """
     script_path = SCRIPT_DIR / script_name
     
     print(f"\n{'='*60}")
@@ -32,9 +39,13 @@ def run_script(script_name: str, description: str) -> bool:
         result = subprocess.run(
             [sys.executable, str(script_path)],
             cwd=str(SCRIPT_DIR),
-            capture_output=False
+            stdout=subprocess.PIPE if capture else None,
+            stderr=subprocess.STDOUT if capture else None,
+            text=True
         )
         
+        if result.returncode != 0 and capture:
+            print(result.stdout)
         if result.returncode == 0:
             print(f"✓ {script_name} completed successfully")
             return True
@@ -47,6 +58,36 @@ def run_script(script_name: str, description: str) -> bool:
         return False
 
 
+def run_stage(module_name: str, description: str) -> bool:
+    """
+    Import a generator script and call its main() in this process.
+    
+    Running in-process avoids starting a new interpreter (and re-importing
+    spaCy) for every step.
+    """
+    print(f"\n{'='*60}")
+    print(f"Step: {description}")
+    print(f"Running: {module_name}.py")
+    print('='*60)
+    
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    
+    try:
+        importlib.import_module(module_name).main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"✗ {module_name}.py failed with exit code {e.code}")
+            return False
+    except Exception as e:
+        traceback.print_exc()
+        print(f"✗ Error running {module_name}.py: {e}")
+        return False
+    
+    print(f"✓ {module_name}.py completed successfully")
+    return True
+
+
 def check_dependencies():
     """Check if required packages are installed."""
     print("\n" + "="*60)
@@ -59,14 +100,17 @@ def check_dependencies():
     try:
         import spacy
         print("✓ spaCy installed")
-        # Check for model
-        try:
-            nlp = spacy.load('en_core_web_lg')
-            print("✓ en_core_web_lg model loaded")
-        except OSError:
-            print("✗ en_core_web_lg model not found")
-            print("  Run: python -m spacy download en_core_web_lg")
-            missing.append("spacy model")
+        # Check for models; the steps load them themselves, so only check
+        # that the packages are installed instead of loading them here.
+        # en_core_web_lg builds the data files, en_core_web_sm is the
+        # MorphologicalPreprocessor default used by main.py
+        for model in ('en_core_web_lg', 'en_core_web_sm'):
+            if spacy.util.is_package(model):
+                print(f"✓ {model} model installed")
+            else:
+                print(f"✗ {model} model not found")
+                print(f"  Run: python -m spacy download {model}")
+                missing.append(f"spacy model {model}")
     except ImportError:
         print("✗ spaCy not installed")
         print("  Run: pip install spacy")
@@ -96,19 +140,24 @@ def main():
         print("\n⚠ Please install missing dependencies and try again.")
         sys.exit(1)
     
-    # Scripts to run in order
-    scripts = [
-        ("lexicon_generator.py", "Generate lexicon with morphological features"),
-        ("english_cfg.py", "Generate CFG grammar rules"),
-        ("subcategorization_extractor.py", "Extract verb subcategorization from VerbNet"),
+    # Scripts to run in order (module names, importable from SCRIPT_DIR)
+    stages = [
+        ("lexicon_generator", "Generate lexicon with morphological features"),
+        ("english_cfg", "Generate CFG grammar rules"),
+        ("subcategorization_extractor", "Extract verb subcategorization from VerbNet"),
     ]
     
-    # Run each script
+    # Run each script in-process, or in a fresh interpreter with --subprocess
+    isolated = '--subprocess' in sys.argv[1:]
     success = True
-    for script_name, description in scripts:
-        if not run_script(script_name, description):
+    for module_name, description in stages:
+        if isolated:
+            ok = run_script(f"{module_name}.py", description, capture=True)
+        else:
+            ok = run_stage(module_name, description)
+        if not ok:
             success = False
-            print(f"\n⚠ Initialization failed at: {script_name}")
+            print(f"\n⚠ Initialization failed at: {module_name}.py")
             sys.exit(1)
     
     # Summary
@@ -121,7 +170,7 @@ def main():
     print("  • data/verb_subcategorization.json")
     
     # Check if --run flag was passed
-    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+    if '--run' in sys.argv[1:]:
         print("\n" + "="*60)
         print("Starting English Parser...")
         print("="*60 + "\n")
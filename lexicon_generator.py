@@ -11,9 +11,20 @@ The output lexicon is used by the CKY parser for agreement checking.
 
 import json
 import os
+import re
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, NamedTuple, Optional
+from collections import Counter
+from types import MappingProxyType
+
+# orjson is optional: it speeds up lexicon file I/O when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Try to import spaCy, provide instructions if not available
 try:
@@ -25,25 +36,146 @@ except ImportError:
     print("Then download model: python -m spacy download en_core_web_lg")
 
 
+def _read_json(filepath: str) -> Any:
+    """Read a JSON file, with orjson when it is available."""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class LexEntry(NamedTuple):
+    """One analysis of a word: its POS tag and morphological features (None if absent)."""
+    word: str
+    pos: str
+    lemma: str
+    num: Optional[str] = None
+    person: Optional[str] = None
+    tense: Optional[str] = None
+    verb_form: Optional[str] = None
+    
+    def as_dict(self) -> Dict[str, str]:
+        """The entry as stored in lexicon files, without the absent features."""
+        return {key: value for key, value in zip(self._fields, self) if value is not None}
+
+
+def compact_lexicon(lexicon: Dict[str, List[LexEntry]]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Convert a lexicon to the POS-keyed layout {word: {pos: features}}.
+    
+    The 'word' and 'pos' fields are dropped from each entry, since they are
+    the keys it is stored under.
+    """
+    return {word: {entry.pos: {key: value for key, value in zip(LexEntry._fields[2:], entry[2:])
+                               if value is not None}
+                   for entry in entries}
+            for word, entries in lexicon.items()}
+
+
+def expand_lexicon(data: Dict[str, Any]) -> Dict[str, List[Dict]]:
+    """
+    Convert a POS-keyed lexicon back to {word: [entry, ...]}.
+    
+    A lexicon already in the list layout is returned unchanged.
+    """
+    if all(isinstance(entries, list) for entries in data.values()):
+        return data
+    return {word: [{'word': word, 'pos': pos, **features} for pos, features in entries.items()]
+            for word, entries in data.items()}
+
+
+# Person and number of common personal pronouns (PRP)
+PRONOUN_FEATURES = MappingProxyType({
+    'i': {'num': 'sg', 'person': '1'},
+    'me': {'num': 'sg', 'person': '1'},
+    'we': {'num': 'pl', 'person': '1'},
+    'us': {'num': 'pl', 'person': '1'},
+    'you': {'num': 'any', 'person': '2'},
+    'he': {'num': 'sg', 'person': '3'},
+    'him': {'num': 'sg', 'person': '3'},
+    'she': {'num': 'sg', 'person': '3'},
+    'her': {'num': 'sg', 'person': '3'},
+    'it': {'num': 'sg', 'person': '3'},
+    'they': {'num': 'pl', 'person': '3'},
+    'them': {'num': 'pl', 'person': '3'},
+})
+
+# Number compatibility of determiners (DT)
+DET_NUMBER = MappingProxyType({
+    'a': 'sg',
+    'an': 'sg',
+    'the': 'any',
+    'this': 'sg',
+    'that': 'sg',
+    'these': 'pl',
+    'those': 'pl',
+    'some': 'any',
+    'all': 'any',
+    'any': 'any',
+    'no': 'any',
+    'every': 'sg',
+    'each': 'sg',
+    'either': 'sg',
+    'neither': 'sg',
+    'both': 'pl',
+})
+
+# Cardinal numbers (CD) that are singular: one, 1, zero, 0
+SINGULAR_CD = frozenset({'one', 'zero', '0', '1'})
+
+# "1." followed only by zeros: always exactly 1.0
+ONE_DECIMAL_RE = re.compile(r'1\.0*')
+
+# spaCy morph feature -> (our feature, value conversion), applied in order
+MORPH_FEATURE_MAP = (
+    ('Number', 'num', lambda value: 'sg' if value == 'Sing' else 'pl'),
+    ('Person', 'person', str),
+    ('Tense', 'tense', str.lower),
+    ('VerbForm', 'verb_form', str.lower),
+)
+
+# Tags without inflection: their entries get no features beyond the word
+# itself, so spaCy is not run for them. MD is left out on purpose, since
+# spaCy normalizes contracted modals ('ll -> will, 'd -> would).
+NO_MORPH_TAGS = frozenset({'CC', 'IN', 'TO', 'RP', 'UH', 'SYM', 'WDT', 'WRB', 'WP', 'WP$',
+                           '.', ',', ':', '(', ')', '"', "''", '``', '-LRB-', '-RRB-', '#', '$'})
+
+# Features counted by LexiconGenerator.get_stats
+STATS_FEATURES = ('num', 'person', 'tense')
+
+
 class LexiconGenerator:
     """
     Generates a lexicon with morphological features from Penn Treebank data.
     """
     
-    def __init__(self, spacy_model: str = "en_core_web_lg"):
+    def __init__(self, spacy_model: str = "en_core_web_lg", n_process: Optional[int] = None,
+                 cache_path: Optional[str] = None):
         """
         Initialize the lexicon generator.
         
         Args:
             spacy_model: Name of the spaCy model to use for morphological analysis
+            n_process: Worker processes for spaCy in build_lexicon
+                       (default: half the CPU cores)
+            cache_path: File caching the spaCy analysis of each word between
+                        runs (default: data/.morph_cache.json)
         """
         self.lexicon = {}
         self.nlp = None
         self.spacy_model = spacy_model
+        self._features_cache = {}  # (word, pos_tag) -> features
+        self.n_process = n_process or max(1, (os.cpu_count() or 1) // 2)
+        if cache_path is None:
+            cache_path = Path(__file__).parent / "data" / ".morph_cache.json"
+        self.cache_path = Path(cache_path)
         
         if SPACY_AVAILABLE:
             try:
-                self.nlp = spacy.load(spacy_model)
+                # Only the lemma and morphology are used: those come from the
+                # tagger, attribute ruler and lemmatizer, so skip parsing and NER
+                self.nlp = spacy.load(spacy_model, disable=["parser", "ner", "senter"])
                 print(f"Loaded spaCy model: {spacy_model}")
             except OSError:
                 print(f"spaCy model '{spacy_model}' not found.")
@@ -59,54 +191,52 @@ class LexiconGenerator:
         Returns:
             Dictionary mapping POS tags to word lists
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _read_json(filepath)
         print(f"Loaded {sum(len(v) for v in data.values())} words from {filepath}")
         return data
     
-    def get_morphological_features(self, word: str, pos_tag: str) -> Dict[str, Any]:
+    def get_morphological_features(self, word: str, pos_tag: str,
+                                   analysis: Optional[Dict[str, str]] = None) -> LexEntry:
         """
         Extract morphological features using spaCy.
         
         Args:
             word: The word to analyze
             pos_tag: The Penn Treebank POS tag
+            analysis: spaCy features of the word from _analyze_doc, if already
+                      computed (build_lexicon runs the words through nlp.pipe)
             
         Returns:
-            Dictionary of morphological features
+            Lexicon entry with the morphological features (memoized per
+            (word, pos_tag), as the spaCy model does not change)
         """
+        key = (word, pos_tag)
+        entry = self._features_cache.get(key)
+        if entry is None:
+            entry = self._features_cache[key] = self._extract_features(word, pos_tag, analysis)
+        return entry
+    
+    def _extract_features(self, word: str, pos_tag: str,
+                          analysis: Optional[Dict[str, str]]) -> LexEntry:
+        """Compute the features returned by get_morphological_features."""
         features = {
             'word': word,
             'pos': pos_tag,
             'lemma': word,  # Default to same word
         }
         
+        if pos_tag in NO_MORPH_TAGS:
+            return LexEntry(**features)
+        
         if self.nlp is None:
             # If spaCy not available, infer features from POS tag
             features.update(self._infer_features_from_pos(word, pos_tag))
-            return features
+            return LexEntry(**features)
         
         # Use spaCy for morphological analysis
-        doc = self.nlp(word)
-        if len(doc) > 0:
-            token = doc[0]
-            features['lemma'] = token.lemma_
-            
-            # Extract morph features
-            morph = token.morph.to_dict()
-            
-            # Map spaCy morph features to our format
-            if 'Number' in morph:
-                features['num'] = 'sg' if morph['Number'] == 'Sing' else 'pl'
-            
-            if 'Person' in morph:
-                features['person'] = morph['Person']
-            
-            if 'Tense' in morph:
-                features['tense'] = morph['Tense'].lower()
-            
-            if 'VerbForm' in morph:
-                features['verb_form'] = morph['VerbForm'].lower()
+        if analysis is None:
+            analysis = self._analyze_doc(self.nlp(word))
+        features.update(analysis)
         
         # Also use POS tag to infer features (as backup/supplement)
         inferred = self._infer_features_from_pos(word, pos_tag)
@@ -114,7 +244,54 @@ class LexiconGenerator:
             if key not in features:
                 features[key] = value
         
-        return features
+        return LexEntry(**features)
+    
+    @staticmethod
+    def _analyze_doc(doc) -> Dict[str, str]:
+        """
+        Map the spaCy analysis of a one-word doc to our feature format.
+        
+        Returns the lemma and whichever of num, person, tense and verb_form
+        spaCy found (empty if the doc has no tokens).
+        """
+        if len(doc) == 0:
+            return {}
+        token = doc[0]
+        analysis = {'lemma': token.lemma_}
+        
+        # Extract morph features and map them to our format
+        morph = token.morph.to_dict()
+        for morph_key, feature, convert in MORPH_FEATURE_MAP:
+            value = morph.get(morph_key)
+            if value is not None:
+                analysis[feature] = convert(value)
+        return analysis
+    
+    def _analysis_cache_key(self) -> str:
+        """Identify the model and spaCy version the cached analyses came from."""
+        model_version = getattr(self.nlp, 'meta', {}).get('version', '')
+        return f"{self.spacy_model}:{model_version}:{spacy.__version__}"
+    
+    def _load_analysis_cache(self) -> Dict[str, Dict[str, str]]:
+        """Load cached word analyses; empty if missing, unreadable or from another model."""
+        try:
+            cache = _read_json(self.cache_path)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get('key') != self._analysis_cache_key():
+            return {}
+        return cache.get('analyses', {})
+    
+    def _save_analysis_cache(self, analyses: Dict[str, Dict[str, str]]):
+        """Write the word analyses cache atomically (temp file + rename)."""
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': self._analysis_cache_key(), 'analyses': analyses},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Warning: could not write analysis cache {self.cache_path}: {e}")
     
     def _infer_features_from_pos(self, word: str, pos_tag: str) -> Dict[str, Any]:
         """
@@ -166,65 +343,36 @@ class LexiconGenerator:
         
         # Pronouns - infer person and number from common pronouns
         if pos_tag == 'PRP':
-            pronoun_features = {
-                'i': {'num': 'sg', 'person': '1'},
-                'me': {'num': 'sg', 'person': '1'},
-                'we': {'num': 'pl', 'person': '1'},
-                'us': {'num': 'pl', 'person': '1'},
-                'you': {'num': 'any', 'person': '2'},
-                'he': {'num': 'sg', 'person': '3'},
-                'him': {'num': 'sg', 'person': '3'},
-                'she': {'num': 'sg', 'person': '3'},
-                'her': {'num': 'sg', 'person': '3'},
-                'it': {'num': 'sg', 'person': '3'},
-                'they': {'num': 'pl', 'person': '3'},
-                'them': {'num': 'pl', 'person': '3'},
-            }
-            if word.lower() in pronoun_features:
-                features.update(pronoun_features[word.lower()])
+            pronoun = PRONOUN_FEATURES.get(word.lower())
+            if pronoun is not None:
+                features.update(pronoun)
         
         # Determiners - infer number compatibility
         if pos_tag == 'DT':
-            det_number = {
-                'a': 'sg',
-                'an': 'sg',
-                'the': 'any',
-                'this': 'sg',
-                'that': 'sg',
-                'these': 'pl',
-                'those': 'pl',
-                'some': 'any',
-                'all': 'any',
-                'any': 'any',
-                'no': 'any',
-                'every': 'sg',
-                'each': 'sg',
-                'either': 'sg',
-                'neither': 'sg',
-                'both': 'pl',
-            }
-            if word.lower() in det_number:
-                features['num'] = det_number[word.lower()]
+            det_num = DET_NUMBER.get(word.lower())
+            if det_num is not None:
+                features['num'] = det_num
         
         # Cardinal numbers (CD)
         if pos_tag == 'CD':
             word_lower = word.lower().strip()
             
-            # Singular numbers: one, 1, 1.0, zero, 0
-            singular_patterns = ['one', 'zero', '0', '1']
-            
             # Check for exact singular match
-            if word_lower in singular_patterns:
+            if word_lower in SINGULAR_CD:
                 features['num'] = 'sg'
             # Check for numeric "1" at the start (like "1.0", "1.00")
-            elif word_lower.startswith('1.') or word_lower.startswith('1,'):
+            elif word_lower.startswith(('1.', '1,')):
                 # Numbers like 1.5 are typically plural ("1.5 books")
-                # But 1.0 could be singular
-                try:
-                    num_val = float(word_lower.replace(',', ''))
-                    features['num'] = 'sg' if num_val == 1.0 else 'pl'
-                except ValueError:
-                    features['num'] = 'pl'
+                # But 1.0 could be singular; "1.", "1.0", "1.00"... are
+                # matched directly, anything else is parsed as a float
+                if ONE_DECIMAL_RE.fullmatch(word_lower):
+                    features['num'] = 'sg'
+                else:
+                    try:
+                        num_val = float(word_lower.replace(',', ''))
+                        features['num'] = 'sg' if num_val == 1.0 else 'pl'
+                    except ValueError:
+                        features['num'] = 'pl'
             else:
                 # All other numbers are plural
                 features['num'] = 'pl'
@@ -250,32 +398,55 @@ class LexiconGenerator:
         closed_class = self.load_pos_data(closed_class_file)
         open_class = self.load_pos_data(open_class_file)
         
-        # Merge all POS data
-        all_pos_data = {**closed_class, **open_class}
+        # All (POS tag, words) groups of both files. Not merged into one
+        # dict: a tag listed in both files keeps the words from each
+        pos_groups = list(chain(closed_class.items(), open_class.items()))
         
         # Build lexicon with features
         self.lexicon = {}
-        total_words = sum(len(words) for words in all_pos_data.values())
+        total_words = sum(len(words) for _, words in pos_groups)
         processed = 0
         
         print(f"Processing {total_words} words...")
         
-        for pos_tag, words in all_pos_data.items():
+        # Run spaCy over all words in batches instead of one nlp() call each,
+        # spread over worker processes (the tagger does real work per word).
+        # The analysis of a lone word does not depend on its POS tag, so a
+        # word listed under several tags is analyzed once. Analyses from
+        # earlier runs with the same model are reused from the cache file.
+        # Words listed only under NO_MORPH_TAGS need no analysis at all.
+        analyses = {}
+        if self.nlp is not None:
+            analyses = self._load_analysis_cache()
+            missing = [word for word in dict.fromkeys(word for pos_tag, words in pos_groups
+                                                      if pos_tag not in NO_MORPH_TAGS
+                                                      for word in words)
+                       if word not in analyses]
+            if missing:
+                print(f"Analyzing {len(missing)} words with spaCy "
+                      f"({len(analyses)} cached)...")
+                docs = self.nlp.pipe(missing, batch_size=500, n_process=self.n_process)
+                analyses.update(zip(missing, map(self._analyze_doc, docs)))
+                self._save_analysis_cache(analyses)
+        
+        word_pos_tags = {}  # Word -> POS tags already in its entry list
+        for pos_tag, words in pos_groups:
             for word in words:
-                features = self.get_morphological_features(word, pos_tag)
-                
                 # A word might have multiple POS tags, store as list
                 if word not in self.lexicon:
                     self.lexicon[word] = []
+                    word_pos_tags[word] = set()
                 
-                # Check if this POS already exists for word
-                existing_pos = [entry['pos'] for entry in self.lexicon[word]]
-                if pos_tag not in existing_pos:
+                # Skip the word if this POS already exists for it
+                if pos_tag not in word_pos_tags[word]:
+                    word_pos_tags[word].add(pos_tag)
+                    features = self.get_morphological_features(word, pos_tag, analyses.get(word))
                     self.lexicon[word].append(features)
-                
-                processed += 1
-                if processed % 1000 == 0:
-                    print(f"  Processed {processed}/{total_words} words...")
+            
+            # Report progress per POS tag, whenever another 1000 words are done
+            if (processed + len(words)) // 1000 > processed // 1000:
+                print(f"  Processed {processed + len(words)}/{total_words} words...")
+            processed += len(words)
         
         print(f"Lexicon built with {len(self.lexicon)} unique words")
         
@@ -285,20 +456,40 @@ class LexiconGenerator:
         
         return self.lexicon
     
-    def save_lexicon(self, filepath: str):
-        """Save the lexicon to a JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.lexicon, f, indent=2, ensure_ascii=False)
+    def save_lexicon(self, filepath: str, compact: bool = False):
+        """
+        Save the lexicon to a JSON file.
+        
+        Args:
+            filepath: Output path
+            compact: Write the POS-keyed layout of compact_lexicon() without
+                     indentation (smaller and faster to load). The default
+                     list layout is what MorphologicalPreprocessor reads.
+        """
+        if compact:
+            data = compact_lexicon(self.lexicon)
+        else:
+            data = {word: [entry.as_dict() for entry in entries]
+                    for word, entries in self.lexicon.items()}
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                if compact:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+                else:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"Lexicon saved to {filepath}")
     
-    def load_lexicon(self, filepath: str) -> Dict[str, List[Dict]]:
-        """Load a lexicon from a JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.lexicon = json.load(f)
+    def load_lexicon(self, filepath: str) -> Dict[str, List[LexEntry]]:
+        """Load a lexicon from a JSON file (either layout)."""
+        self.lexicon = {word: [LexEntry(**entry) for entry in entries]
+                        for word, entries in expand_lexicon(_read_json(filepath)).items()}
         print(f"Loaded lexicon with {len(self.lexicon)} words from {filepath}")
         return self.lexicon
     
-    def lookup(self, word: str) -> List[Dict]:
+    def lookup(self, word: str) -> List[LexEntry]:
         """
         Look up a word in the lexicon.
         
@@ -308,40 +499,37 @@ class LexiconGenerator:
         Returns:
             List of possible analyses (word might have multiple POS tags)
         """
-        # Try exact match first
-        if word in self.lexicon:
-            return self.lexicon[word]
+        # Try exact match first (one hash lookup when found)
+        entries = self.lexicon.get(word)
+        if entries is not None:
+            return entries
         
-        # Try lowercase
-        if word.lower() in self.lexicon:
-            return self.lexicon[word.lower()]
-        
-        # Word not found
-        return []
+        # Try lowercase; word not found -> []
+        lowered = word.lower()
+        if lowered == word:
+            return []
+        return self.lexicon.get(lowered, [])
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the lexicon."""
         if not self.lexicon:
             return {'error': 'Lexicon is empty'}
         
-        pos_counts = defaultdict(int)
-        words_with_features = defaultdict(int)
-        
-        for word, entries in self.lexicon.items():
-            for entry in entries:
-                pos_counts[entry['pos']] += 1
-                if 'num' in entry:
-                    words_with_features['num'] += 1
-                if 'person' in entry:
-                    words_with_features['person'] += 1
-                if 'tense' in entry:
-                    words_with_features['tense'] += 1
+        # Count with Counter and list.count over attrgetter maps rather than
+        # per-entry Python increments
+        entries = list(chain.from_iterable(self.lexicon.values()))
+        pos_counts = Counter(map(attrgetter('pos'), entries))
+        words_with_features = {}
+        for feature in STATS_FEATURES:
+            count = len(entries) - list(map(attrgetter(feature), entries)).count(None)
+            if count:
+                words_with_features[feature] = count
         
         return {
             'total_words': len(self.lexicon),
-            'total_entries': sum(len(v) for v in self.lexicon.values()),
+            'total_entries': len(entries),
             'pos_counts': dict(pos_counts),
-            'feature_counts': dict(words_with_features)
+            'feature_counts': words_with_features
         }
 
 
@@ -389,7 +577,7 @@ def main():
         if entries:
             print(f"\n  {word}:")
             for entry in entries:
-                print(f"    {entry}")
+                print(f"    {entry.as_dict()}")
         else:
             print(f"\n  {word}: NOT FOUND")
 
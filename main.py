@@ -15,19 +15,234 @@ Usage:
     python main.py -f sentences.txt   # Parse sentences from file
 """
 
-import json
+import contextlib
+import copy
+import io
+import multiprocessing
+import os
 import sys
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 
 # Import all modules
-from morphological_preprocessor import MorphologicalPreprocessor
+from morphological_preprocessor import MorphologicalPreprocessor, load_json_cached
 from english_cfg import EnglishCFG
 from cnf_converter import CFGtoCNFConverter
 from cky_parser import CKYParser
 from parse_tree_converter import ParseTreeConverter
 from agreement_checker import AgreementChecker
 
+# Numba is optional: when available, the POS pattern scan of the agreement
+# checks is compiled
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# POS tag classes used by the subcategorization check
+OBJECT_NP_START_TAGS = frozenset({'DT', 'PRP', 'NNP', 'NNPS', 'CD', 'PRP$', 'NN', 'NNS'})
+
+# Indefinite pronouns (everyone, many, ...) as subjects; the singular ones
+# are tagged as NN
+SINGULAR_INDEFINITES = frozenset({'everyone', 'everybody', 'someone', 'somebody',
+                                  'anyone', 'anybody', 'no one', 'nobody',
+                                  'everything', 'something', 'anything', 'nothing'})
+PLURAL_INDEFINITES = frozenset({'many', 'few', 'several', 'both'})
+
+# Most recent parse() results kept by EnglishParser
+PARSE_CACHE_SIZE = 4096
+
+# Sentence files at least this long are parsed in worker processes
+PARALLEL_MIN_SENTENCES = 16
+
+# Integer codes of the POS tags that the agreement scan distinguishes (every
+# other tag is 0). The order allows range tests: NN..NNS are common nouns,
+# NN..NNPS nouns, NN..PRP and NN..DT the conjuncts around CC, JJ..RB the
+# modifiers between DT and its noun, VBZ..VBP the verbs that agree with
+# the subject and VBZ..VBN all verbs.
+(TAG_NN, TAG_NNS, TAG_NNP, TAG_NNPS, TAG_PRP, TAG_DT, TAG_JJ, TAG_JJR, TAG_JJS, TAG_RB,
+ TAG_VBZ, TAG_VBP, TAG_VB, TAG_VBD, TAG_VBG, TAG_VBN,
+ TAG_PRP_POSS, TAG_EX, TAG_CC, TAG_IN) = range(1, 21)
+TAG_CODES = MappingProxyType({
+    'NN': TAG_NN, 'NNS': TAG_NNS, 'NNP': TAG_NNP, 'NNPS': TAG_NNPS, 'PRP': TAG_PRP,
+    'DT': TAG_DT, 'JJ': TAG_JJ, 'JJR': TAG_JJR, 'JJS': TAG_JJS, 'RB': TAG_RB,
+    'VBZ': TAG_VBZ, 'VBP': TAG_VBP, 'VB': TAG_VB, 'VBD': TAG_VBD, 'VBG': TAG_VBG,
+    'VBN': TAG_VBN, 'PRP$': TAG_PRP_POSS, 'EX': TAG_EX, 'CC': TAG_CC, 'IN': TAG_IN,
+})
+NUM_TAG_CODES = TAG_IN + 1
+
+# Subject patterns reported by _scan_pos_codes
+SUBJ_NONE, SUBJ_PRP, SUBJ_NP, SUBJ_EX_NP, SUBJ_EX_PRP, SUBJ_COORD, SUBJ_QUANT = range(7)
+
+
+def _subject_pattern(c0: int, c1: int, c2: int) -> Tuple[int, int]:
+    """
+    Match subject patterns 1-8, which only look at the first three tags.
+    
+    Args:
+        c0, c1, c2: Tag codes of the first three words (0 past the end)
+    
+    Returns:
+        (SUBJ_* kind, index of the subject word)
+    """
+    # 1. PRP subject (I, he, she, they, etc.)
+    if c0 == TAG_PRP:
+        return SUBJ_PRP, 0
+    # 2. DT + NN/NNS subject (the cat, the cats)
+    if c0 == TAG_DT and TAG_NN <= c1 <= TAG_NNS:
+        return SUBJ_NP, 1
+    # 3. DT + JJ + NN/NNS subject (the big cat)
+    if c0 == TAG_DT and c1 == TAG_JJ and TAG_NN <= c2 <= TAG_NNS:
+        return SUBJ_NP, 2
+    # 4-6. Bare NNP/NNPS/NNS/NN subject (John, Americans, Cats run, Coffee is good)
+    if TAG_NN <= c0 <= TAG_NNPS:
+        return SUBJ_NP, 0
+    # 7. PRP$ + NN/NNS subject (My cat runs, My cats run)
+    if c0 == TAG_PRP_POSS and TAG_NN <= c1 <= TAG_NNS:
+        return SUBJ_NP, 1
+    # 8. PRP$ + JJ + NN/NNS subject (My big cat runs)
+    if c0 == TAG_PRP_POSS and c1 == TAG_JJ and TAG_NN <= c2 <= TAG_NNS:
+        return SUBJ_NP, 2
+    return SUBJ_NONE, 0
+
+
+# Jump table of _subject_pattern over all code triples, entry
+# (c0 * NUM_TAG_CODES + c1) * NUM_TAG_CODES + c2 holding kind << 2 | index
+SUBJECT_TABLE = bytes(kind << 2 | index
+                      for c0 in range(NUM_TAG_CODES)
+                      for c1 in range(NUM_TAG_CODES)
+                      for c2 in range(NUM_TAG_CODES)
+                      for kind, index in [_subject_pattern(c0, c1, c2)])
+
+
+def _scan_pos_codes(codes, dt_pairs):
+    """
+    Find the positions the agreement checks need in a tag-encoded sentence.
+    
+    Works on TAG_CODES values only, so that it can be compiled by Numba.
+    Writes the (DT, noun) index pairs to dt_pairs, two ints per pair.
+    
+    Returns:
+        The fields of TagScan after dt_pairs. The subject index is the word
+        holding the subject's features (SUBJ_PRP, SUBJ_EX_PRP) or number
+        (SUBJ_NP, SUBJ_EX_NP, SUBJ_QUANT). SUBJ_QUANT only applies if the
+        first word is not an indefinite pronoun, which needs its lemma.
+    """
+    n = len(codes)
+    
+    # One pass for the verbs and the DT-NN pairs
+    agreeing_verb_idx = -1
+    verb_idx = -1
+    has_pp = False
+    
+    # DT-NN pairs (including DT + JJ* + NN/NNS patterns): a DT stays open
+    # while modifiers follow it and pairs with the noun that ends the run;
+    # any other tag closes it
+    num_pairs = 0
+    open_dt = -1
+    for i in range(n):
+        code = codes[i]
+        
+        # Main verb for agreement: the first VBZ/VBP
+        if agreeing_verb_idx < 0 and TAG_VBZ <= code <= TAG_VBP:
+            agreeing_verb_idx = i
+        # Main verb for subcategorization: the first verb of any form, and
+        # whether a PP (IN + NP) follows it
+        if verb_idx < 0:
+            if TAG_VBZ <= code <= TAG_VBN:
+                verb_idx = i
+        elif code == TAG_IN and i < n - 1:
+            has_pp = True
+        
+        if TAG_JJ <= code <= TAG_RB:
+            continue
+        if open_dt >= 0 and TAG_NN <= code <= TAG_NNS:
+            dt_pairs[2 * num_pairs] = open_dt
+            dt_pairs[2 * num_pairs + 1] = i
+            num_pairs += 1
+        open_dt = i if code == TAG_DT else -1
+    
+    # 1-8. Patterns on the first three tags, from the jump table
+    c0 = codes[0] if n > 0 else 0
+    c1 = codes[1] if n > 1 else 0
+    c2 = codes[2] if n > 2 else 0
+    entry = SUBJECT_TABLE[(c0 * NUM_TAG_CODES + c1) * NUM_TAG_CODES + c2]
+    subj_kind = entry >> 2
+    subj_idx = entry & 3 if subj_kind != SUBJ_NONE else -1
+    
+    # 9. There-insertion (There is/are books): the verb agrees with the
+    # first NP after "there"
+    if c0 == TAG_EX:
+        for i in range(1, n):
+            if TAG_NN <= codes[i] <= TAG_NNPS:
+                subj_kind = SUBJ_EX_NP
+                subj_idx = i
+                break
+            elif codes[i] == TAG_PRP:
+                subj_kind = SUBJ_EX_PRP
+                subj_idx = i
+                break
+    
+    # 10. Coordinated subject (The cat and the dog run) - ALWAYS PLURAL
+    # Look for an NP CC NP pattern within the first five words, noting
+    # on the way whether a noun (or PRP) comes before the CC
+    cc_idx = -1
+    has_noun_before = False
+    for i in range(min(5, n)):
+        code = codes[i]
+        if code == TAG_CC:
+            cc_idx = i
+            break
+        if TAG_NN <= code <= TAG_PRP:
+            has_noun_before = True
+    if cc_idx >= 0 and has_noun_before:
+        # Check if there's a noun (or PRP/DT) in the two words after CC
+        for i in range(cc_idx + 1, min(cc_idx + 3, n)):
+            if TAG_NN <= codes[i] <= TAG_DT:
+                subj_kind = SUBJ_COORD
+                subj_idx = -1
+                break
+    
+    # 12. Quantifiers: "All of the water is...", "Some of the books are..."
+    # Pattern: DT + IN + DT + NN/NNS - number comes from inner NP
+    if subj_kind == SUBJ_NONE and n >= 4 and c0 == TAG_DT and c1 == TAG_IN and c2 == TAG_DT:
+        for i in range(3, min(6, n)):
+            if TAG_NN <= codes[i] <= TAG_NNS:
+                subj_kind = SUBJ_QUANT
+                subj_idx = i
+                break
+    
+    return num_pairs, subj_kind, subj_idx, agreeing_verb_idx, verb_idx, has_pp
+
+
+if NUMBA_AVAILABLE:
+    _scan_pos_codes = njit(cache=True)(_scan_pos_codes)
+
+
+class TagScan(NamedTuple):
+    """Positions in a sentence that the agreement and subcategorization checks use."""
+    dt_pairs: array           # (DT, noun) index pairs, flattened
+    num_pairs: int
+    subj_kind: int            # SUBJ_* pattern
+    subj_idx: int
+    agreeing_verb_idx: int    # First VBZ/VBP, or -1
+    verb_idx: int             # First verb of any form, or -1
+    has_pp: bool              # An IN follows that verb, before the last word
+
+
+def scan_pos_tags(pos_tags: List[str]) -> TagScan:
+    """Encode the tags with TAG_CODES and scan them in one pass (see _scan_pos_codes)."""
+    tag_code = TAG_CODES.get
+    codes = bytes([tag_code(pos, 0) for pos in pos_tags])
+    dt_pairs = array('i', bytes(4 * len(codes)))
+    return TagScan(dt_pairs, *_scan_pos_codes(codes, dt_pairs))
+
 
 class EnglishParser:
     """
@@ -49,6 +264,7 @@ class EnglishParser:
             verbose: Print detailed output
         """
         self.verbose = verbose
+        self._parse_cache = OrderedDict()  # Sentence -> (result, verbose output), least recently used first
         
         # Get default paths
         script_dir = Path(__file__).parent
@@ -65,10 +281,11 @@ class EnglishParser:
         # 1. Load morphological preprocessor
         self.preprocessor = MorphologicalPreprocessor(str(lexicon_path))
         
-        # 2. Load grammar (initially structural)
-        if Path(grammar_path).exists():
-            self.cfg = EnglishCFG.load_grammar(str(grammar_path))
-        else:
+        # 2. Load grammar (initially structural); opening the files directly
+        # instead of checking for them first saves a stat() per file
+        try:
+            self.cfg = EnglishCFG.load_grammar(os.fspath(grammar_path))
+        except FileNotFoundError:
             print("Creating new CFG grammar...")
             self.cfg = EnglishCFG()
             self.cfg.save_grammar(str(grammar_path))
@@ -82,29 +299,61 @@ class EnglishParser:
         
         self.cky_parser = CKYParser()
         self.cky_parser.load_grammar_from_converter(self.cnf_converter)
+        # POS tags the structural grammar can build on; a sentence with any
+        # other tag cannot be parsed
+        self.grammar_tags = frozenset(self.cky_parser.terminals)
         
         # 4. Add lexicon terminals to the CFG grammar (for JSON and tree display)
         # We do this AFTER CKY initialization to keep the CNF structural-only.
         self.lexicon_pos_tags = set()
         self._load_lexicon_terminals()
         
-        # 5. Initialize tree converter with the full grammar (now includes terminals)
-        self.tree_converter = ParseTreeConverter()
-        self.tree_converter.load_original_grammar(self.cfg.get_grammar())
-        
-        # 6. Initialize agreement checker
-        self.agreement_checker = AgreementChecker()
+        # 5-6. The tree converter (built from the full grammar, which now
+        # includes terminals) and the agreement checker are created on first use
+        self._tree_converter = None
+        self._agreement_checker = None
         
         # 7. Load verb subcategorization frames
         self.verb_subcat = {}
-        if Path(subcat_path).exists():
-            with open(subcat_path, 'r') as f:
-                data = json.load(f)
-                self.verb_subcat = data.get('verbs', {})
+        try:
+            data = load_json_cached(subcat_path)
+        except FileNotFoundError:
+            pass
+        else:
+            self.verb_subcat = data.get('verbs', {})
+            # Bring every entry to the dict format, with all its keys, so
+            # the subcategorization check reads them directly
+            for lemma, verb_info in self.verb_subcat.items():
+                if isinstance(verb_info, dict):
+                    verb_info.setdefault('allows_np', True)
+                    verb_info.setdefault('requires_pp', False)
+                    verb_info.setdefault('frames', [])
+                else:
+                    # Old format: list of frame types
+                    self.verb_subcat[lemma] = {
+                        'allows_np': 'transitive' in verb_info or 'ditransitive' in verb_info,
+                        'requires_pp': 'pp_required' in verb_info,
+                        'frames': verb_info,
+                    }
             print(f"Loaded {len(self.verb_subcat)} verb subcategorization frames")
         
         print("Parser initialized successfully!\n")
 
+    @property
+    def tree_converter(self) -> ParseTreeConverter:
+        """Converter of CNF parse trees back to the CFG, created on first use."""
+        if self._tree_converter is None:
+            self._tree_converter = ParseTreeConverter()
+            self._tree_converter.load_original_grammar(self.cfg.get_grammar())
+        return self._tree_converter
+    
+    @property
+    def agreement_checker(self) -> AgreementChecker:
+        """Agreement checker, created on first use."""
+        if self._agreement_checker is None:
+            self._agreement_checker = AgreementChecker()
+        return self._agreement_checker
+    
     def _load_lexicon_terminals(self):
         """
         Load terminals from lexicon JSON files and add them to the CFG grammar.
@@ -118,38 +367,106 @@ class EnglishParser:
         ]
         
         total_terminals = 0
+        known = {}  # POS tag -> symbols of its single-symbol productions
         for file_path in files:
-            if not file_path.exists():
+            try:
+                lexicon_data = load_json_cached(file_path)
+            except FileNotFoundError:
                 print(f"Warning: Lexicon file {file_path} not found.")
                 continue
-                
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lexicon_data = json.load(f)
-                
+            
             for pos, words in lexicon_data.items():
                 self.lexicon_pos_tags.add(pos)
                 if pos not in self.cfg.grammar:
                     self.cfg.grammar[pos] = []
+                productions = self.cfg.grammar[pos]
+                
+                # Single-symbol productions of this tag so far, for O(1)
+                # duplicate checks
+                seen = known.get(pos)
+                if seen is None:
+                    seen = known[pos] = {prod[0] for prod in productions if len(prod) == 1}
                 
                 # Add each word as a terminal production [word]
                 for word in words:
-                    production = [word.lower()]
-                    if production not in self.cfg.grammar[pos]:
-                        self.cfg.grammar[pos].append(production)
+                    word = word.lower()
+                    if word not in seen:
+                        seen.add(word)
+                        productions.append([word])
                         total_terminals += 1
-                        
+        
+        # The grammar is complete and read-only from here on: store it as
+        # tuples, which are smaller than lists and cannot be edited by mistake
+        self.cfg.grammar = {nt: tuple(map(tuple, prods))
+                            for nt, prods in self.cfg.grammar.items()}
+        self.cfg.invalidate_caches()
         print(f"Added {total_terminals} terminal rules from lexicon to grammar.")
     
-    def parse(self, sentence: str) -> Dict[str, Any]:
+    def parse(self, sentence: str, analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Parse a sentence.
         
         Args:
             sentence: Input sentence string
+            analysis: Morphological analysis of the sentence, if already
+                      computed (see MorphologicalPreprocessor.analyze_batch)
+            
+        Returns:
+            Dictionary with parsing results (repeated sentences are answered
+            from a cache of the last PARSE_CACHE_SIZE results)
+        """
+        result, log = self.parse_logged(sentence, analysis)
+        if log:
+            sys.stdout.write(log)
+        return result
+    
+    def parse_logged(self, sentence: str,
+                     analysis: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], str]:
+        """
+        Like parse(), but return the verbose output instead of printing it.
+        
+        The output is cached along with the result, so a repeated sentence
+        reports the same lines as its first parse.
+        
+        Returns:
+            Tuple of (parse() result, verbose output - empty unless verbose)
+        """
+        cached = self._parse_cache.get(sentence)
+        if cached is not None:
+            self._parse_cache.move_to_end(sentence)
+            result, log = cached
+            return copy.deepcopy(result), log if self.verbose else ''
+        
+        if self.verbose:
+            with contextlib.redirect_stdout(io.StringIO()) as buf:
+                result = self._parse_uncached(sentence, analysis)
+            log = buf.getvalue()
+        else:
+            result, log = self._parse_uncached(sentence, analysis), ''
+        self._parse_cache[sentence] = (copy.deepcopy(result), log)
+        if len(self._parse_cache) > PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        return result, log
+    
+    def parse_batch(self, sentences: List[str], n_process: int = 1) -> List[Dict[str, Any]]:
+        """
+        Parse several sentences, running spaCy over them in one batch.
+        
+        Args:
+            sentences: Input sentence strings
+            n_process: Worker processes for spaCy
             
         Returns:
-            Dictionary with parsing results
+            One parse() result per sentence, in order
         """
+        # Only sentences not answered from the parse cache need tagging
+        pending = [s for s in dict.fromkeys(sentences) if s not in self._parse_cache]
+        analyses = dict(zip(pending, self.preprocessor.analyze_batch(pending, n_process=n_process)))
+        return [self.parse(sentence, analyses.get(sentence)) for sentence in sentences]
+    
+    def _parse_uncached(self, sentence: str,
+                        morph_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the full analysis, agreement checks and CKY parse for parse()."""
         result = {
             'sentence': sentence,
             'grammatical': False,
@@ -160,13 +477,16 @@ class EnglishParser:
         }
         
         # Step 1: Morphological analysis (spaCy disambiguates - one POS per word)
-        morph_result = self.preprocessor.analyze_sentence(sentence)
+        if morph_result is None:
+            morph_result = self.preprocessor.analyze_sentence(sentence)
         result['word_analyses'] = morph_result['word_analyses']
         result['tokens'] = morph_result['tokens']
         
         # Get the single disambiguated POS sequence
         pos_sequence = morph_result['pos_sequences'][0]  # Only one from spaCy
-        pos_tags = [entry['pos'] for entry in pos_sequence]
+        # Interned, so that comparisons and lookups against the tag constants
+        # take the identity fast path
+        pos_tags = [sys.intern(entry['pos']) for entry in pos_sequence]
         features = pos_sequence
         
         result['pos_sequence'] = pos_tags
@@ -175,9 +495,8 @@ class EnglishParser:
             print(f"POS tags: {' '.join(pos_tags)}")
         
         # Step 2: Check agreements BEFORE parsing
-        feature_dict = {i: feat for i, feat in enumerate(features)}
         agreement_ok, agree_errors = self._check_tree_agreements(
-            None, feature_dict, pos_tags
+            None, features, pos_tags
         )
         
         if not agreement_ok:
@@ -188,6 +507,13 @@ class EnglishParser:
                     print(f"  Agreement error: {err}")
             return result
         
+        # A tag outside the grammar leaves its chart cell empty, so CKY
+        # would fail; say so without filling the chart
+        grammar_tags = self.grammar_tags
+        if not all(tag in grammar_tags for tag in pos_tags):
+            result['errors'].append("No valid parse found for POS sequence")
+            return result
+        
         # Step 3: CKY parse with the actual tokens (words) but constrained by spaCy tags.
         # This gives us the best of both worlds: robust disambiguation from spaCy
         # and the full parse tree with words as leaves from our grammar.
@@ -211,7 +537,7 @@ class EnglishParser:
     
     def _check_tree_agreements(self, 
                                 tree: Tuple,
-                                features: Dict[int, Dict],
+                                features: List[Dict],
                                 pos_tags: List[str]) -> Tuple[bool, List[str]]:
         """
         Check agreements in a parse tree.
@@ -221,170 +547,69 @@ class EnglishParser:
         
         Args:
             tree: Parse tree (tuple format)
-            features: Dictionary mapping position to features
+            features: Features of each word, by position
             pos_tags: List of POS tags
             
         Returns:
             Tuple of (all_agreements_ok, list_of_errors)
         """
         errors = []
+        check_dt_noun = self.agreement_checker._check_dt_noun_agreement
+        
+        # Locate the DT-noun pairs, the subject pattern and the main verbs
+        # in a single pass over the integer-encoded tags
+        scan = scan_pos_tags(pos_tags)
+        dt_pairs = scan.dt_pairs
+        subj_kind = scan.subj_kind
+        subj_idx = scan.subj_idx
+        verb_idx = scan.agreeing_verb_idx
         
         # Check DT-NN agreement (including DT + JJ* + NN/NNS patterns)
-        # Find DT and look for the noun it modifies (may have adjectives in between)
-        i = 0
-        while i < len(pos_tags):
-            if pos_tags[i] == 'DT':
-                dt_idx = i
-                dt_features = features[i]
-                
-                # Find the noun after the determiner (skip adjectives)
-                j = i + 1
-                while j < len(pos_tags) and pos_tags[j] in ('JJ', 'JJR', 'JJS', 'RB'):
-                    j += 1
-                
-                # Check if we found a noun
-                if j < len(pos_tags) and pos_tags[j] in ('NN', 'NNS'):
-                    noun_features = features[j]
-                    ok, error = self.agreement_checker._check_dt_noun_agreement(
-                        dt_features, noun_features, pos_tags[j]
-                    )
-                    if not ok:
-                        errors.append(error)
-                    i = j + 1
-                else:
-                    i += 1
-            else:
-                i += 1
+        for k in range(0, 2 * scan.num_pairs, 2):
+            dt_idx, noun_idx = dt_pairs[k], dt_pairs[k + 1]
+            ok, error = check_dt_noun(
+                features[dt_idx], features[noun_idx], pos_tags[noun_idx]
+            )
+            if not ok:
+                errors.append(error)
         
         # Check subject-verb agreement
-        # Find subject: various patterns at start of sentence
         subj_features = None
         subj_description = ""
         
-        # ========================================
-        # SUBJECT DETECTION PATTERNS
-        # ========================================
-        
-        # 1. PRP subject (I, he, she, they, etc.)
-        if pos_tags[0] == 'PRP':
-            subj_features = features[0]
-            subj_description = f"PRP({subj_features.get('person', '?')}p, {subj_features.get('num', '?')})"
-        
-        # 2. DT + NN/NNS subject (the cat, the cats)
-        elif len(pos_tags) >= 2 and pos_tags[0] == 'DT' and pos_tags[1] in ('NN', 'NNS'):
-            noun_num = 'sg' if pos_tags[1] == 'NN' else 'pl'
-            subj_features = {'num': noun_num, 'person': '3'}
-            subj_description = f"NP(3p, {noun_num})"
-        
-        # 3. DT + JJ + NN/NNS subject (the big cat)
-        elif len(pos_tags) >= 3 and pos_tags[0] == 'DT' and pos_tags[1] == 'JJ' and pos_tags[2] in ('NN', 'NNS'):
-            noun_num = 'sg' if pos_tags[2] == 'NN' else 'pl'
+        if subj_kind == SUBJ_PRP or subj_kind == SUBJ_EX_PRP:
+            subj_features = features[subj_idx]
+            prefix = "PRP" if subj_kind == SUBJ_PRP else "EX+PRP"
+            subj_description = f"{prefix}({subj_features.get('person', '?')}p, {subj_features.get('num', '?')})"
+        elif subj_kind == SUBJ_NP or subj_kind == SUBJ_EX_NP:
+            noun_num = 'sg' if pos_tags[subj_idx] in ('NN', 'NNP') else 'pl'
             subj_features = {'num': noun_num, 'person': '3'}
-            subj_description = f"NP(3p, {noun_num})"
-        
-        # 4. Bare NNP/NNPS subject (John, Americans)
-        elif pos_tags[0] in ('NNP', 'NNPS'):
-            noun_num = 'sg' if pos_tags[0] == 'NNP' else 'pl'
-            subj_features = {'num': noun_num, 'person': '3'}
-            subj_description = f"NP(3p, {noun_num})"
-        
-        # 5. Bare NNS subject - PLURAL (Cats run)
-        elif pos_tags[0] == 'NNS':
+            prefix = "NP" if subj_kind == SUBJ_NP else "EX+NP"
+            subj_description = f"{prefix}(3p, {noun_num})"
+        elif subj_kind == SUBJ_COORD:
+            # Coordinated subjects are ALWAYS plural
             subj_features = {'num': 'pl', 'person': '3'}
-            subj_description = "NP(3p, pl)"
-        
-        # 6. Bare NN subject - SINGULAR (Coffee is good)
-        elif pos_tags[0] == 'NN':
-            subj_features = {'num': 'sg', 'person': '3'}
-            subj_description = "NP(3p, sg)"
-        
-        # 7. PRP$ + NN/NNS subject (My cat runs, My cats run)
-        elif len(pos_tags) >= 2 and pos_tags[0] == 'PRP$' and pos_tags[1] in ('NN', 'NNS'):
-            noun_num = 'sg' if pos_tags[1] == 'NN' else 'pl'
-            subj_features = {'num': noun_num, 'person': '3'}
-            subj_description = f"NP(3p, {noun_num})"
-        
-        # 8. PRP$ + JJ + NN/NNS subject (My big cat runs)
-        elif len(pos_tags) >= 3 and pos_tags[0] == 'PRP$' and pos_tags[1] == 'JJ' and pos_tags[2] in ('NN', 'NNS'):
-            noun_num = 'sg' if pos_tags[2] == 'NN' else 'pl'
-            subj_features = {'num': noun_num, 'person': '3'}
-            subj_description = f"NP(3p, {noun_num})"
-        
-        # 9. There-insertion (There is/are books)
-        # "There" is EX, verb agrees with post-verbal NP
-        elif pos_tags[0] == 'EX':
-            # Find the NP after the verb
-            for i, pos in enumerate(pos_tags[1:], 1):
-                if pos in ('NN', 'NNS', 'NNP', 'NNPS'):
-                    noun_num = 'sg' if pos in ('NN', 'NNP') else 'pl'
-                    subj_features = {'num': noun_num, 'person': '3'}
-                    subj_description = f"EX+NP(3p, {noun_num})"
-                    break
-                elif pos in ('PRP',):
-                    subj_features = features[i]
-                    subj_description = f"EX+PRP({subj_features.get('person', '?')}p, {subj_features.get('num', '?')})"
-                    break
-        
-        # 10. Coordinated subject (The cat and the dog run) - ALWAYS PLURAL
-        # Check for CC (and, or) in subject position
-        if subj_features is None or 'CC' in pos_tags[:5]:
-            # Look for NP CC NP pattern at start
-            cc_idx = None
-            for i in range(min(5, len(pos_tags))):
-                if pos_tags[i] == 'CC':
-                    cc_idx = i
-                    break
-            
-            if cc_idx is not None and cc_idx > 0:
-                # Check if there's a noun before and after CC
-                has_noun_before = any(p in ('NN', 'NNS', 'NNP', 'NNPS', 'PRP') for p in pos_tags[:cc_idx])
-                has_noun_after = cc_idx + 1 < len(pos_tags) and any(
-                    p in ('NN', 'NNS', 'NNP', 'NNPS', 'PRP', 'DT') for p in pos_tags[cc_idx+1:cc_idx+3]
-                )
-                if has_noun_before and has_noun_after:
-                    # Coordinated subjects are ALWAYS plural
-                    subj_features = {'num': 'pl', 'person': '3'}
-                    subj_description = "NP+CC+NP(3p, pl)"
+            subj_description = "NP+CC+NP(3p, pl)"
         
         # 11. Indefinite pronouns (everyone, everybody, someone, nobody, etc.)
-        # These are tagged as NN but are singular
-        SINGULAR_INDEFINITES = {'everyone', 'everybody', 'someone', 'somebody', 
-                                 'anyone', 'anybody', 'no one', 'nobody',
-                                 'everything', 'something', 'anything', 'nothing'}
-        PLURAL_INDEFINITES = {'many', 'few', 'several', 'both'}
-        
-        if subj_features is None and len(pos_tags) > 0:
-            first_word = features[0].get('lemma', '').lower() if features else ''
+        # These are tagged as NN but are singular. They take precedence over
+        # the quantifier pattern.
+        if subj_features is None and pos_tags:
+            first_word = features[0].get('lemma', '').lower()
             if first_word in SINGULAR_INDEFINITES:
                 subj_features = {'num': 'sg', 'person': '3'}
                 subj_description = f"INDEF({first_word}, 3p, sg)"
             elif first_word in PLURAL_INDEFINITES:
                 subj_features = {'num': 'pl', 'person': '3'}
                 subj_description = f"INDEF({first_word}, 3p, pl)"
+            elif subj_kind == SUBJ_QUANT:
+                noun_num = 'sg' if pos_tags[subj_idx] == 'NN' else 'pl'
+                subj_features = {'num': noun_num, 'person': '3'}
+                subj_description = f"QUANT(3p, {noun_num})"
         
-        # 12. Quantifiers: "All of the water is...", "Some of the books are..."
-        # Pattern: DT + IN + DT + NN/NNS - number comes from inner NP
-        if subj_features is None and len(pos_tags) >= 4:
-            if pos_tags[0] == 'DT' and pos_tags[1] == 'IN' and pos_tags[2] == 'DT':
-                for i in range(3, min(6, len(pos_tags))):
-                    if pos_tags[i] in ('NN', 'NNS'):
-                        noun_num = 'sg' if pos_tags[i] == 'NN' else 'pl'
-                        subj_features = {'num': noun_num, 'person': '3'}
-                        subj_description = f"QUANT(3p, {noun_num})"
-                        break
-        
-        # Find main verb
-        verb_idx = None
-        verb_pos = None
-        for i, pos in enumerate(pos_tags):
-            if pos in ('VBZ', 'VBP'):
-                verb_idx = i
-                verb_pos = pos
-                break
-        
-        if subj_features is not None and verb_idx is not None:
+        if subj_features is not None and verb_idx >= 0:
             verb_features = features[verb_idx]
-            verb_features_with_head = {'head_pos': verb_pos, **verb_features}
+            verb_features_with_head = {'head_pos': pos_tags[verb_idx], **verb_features}
             
             ok, error = self.agreement_checker._check_subject_verb_agreement(
                 subj_features, verb_features_with_head
@@ -393,14 +618,15 @@ class EnglishParser:
                 errors.append(error)
         
         # Check verb subcategorization
-        subcat_errors = self._check_verb_subcategorization(pos_tags, features)
+        subcat_errors = self._check_verb_subcategorization(pos_tags, features, scan)
         errors.extend(subcat_errors)
         
         return len(errors) == 0, errors
     
     def _check_verb_subcategorization(self, 
                                        pos_tags: List[str],
-                                       features: Dict[int, Dict]) -> List[str]:
+                                       features: List[Dict],
+                                       scan: Optional[TagScan] = None) -> List[str]:
         """
         Check verb subcategorization (argument structure).
         
@@ -410,7 +636,8 @@ class EnglishParser:
         
         Args:
             pos_tags: List of POS tags
-            features: Dictionary mapping position to features
+            features: Features of each word, by position
+            scan: scan_pos_tags(pos_tags), if already computed
             
         Returns:
             List of error messages
@@ -418,55 +645,31 @@ class EnglishParser:
         errors = []
         
         # Find main verb and analyze its arguments
-        verb_idx = None
-        verb_lemma = None
-        verb_pos = None
-        
-        verb_tags = ('VB', 'VBD', 'VBP', 'VBZ', 'VBG', 'VBN')
-        
-        for i, pos in enumerate(pos_tags):
-            if pos in verb_tags:
-                verb_idx = i
-                verb_pos = pos
-                # Get lemma from features
-                verb_lemma = features[i].get('lemma', '').lower()
-                break
-        
-        if verb_lemma is None or verb_lemma not in self.verb_subcat:
+        if scan is None:
+            scan = scan_pos_tags(pos_tags)
+        verb_idx = scan.verb_idx
+        if verb_idx < 0:
+            return errors  # No verb, skip check
+        
+        # Get lemma from features; nothing else is looked at for verbs
+        # without a subcategorization frame
+        verb_lemma = features[verb_idx].get('lemma', '').lower()
+        verb_info = self.verb_subcat.get(verb_lemma)
+        if verb_info is None:
             return errors  # Unknown verb, skip check
         
-        verb_info = self.verb_subcat[verb_lemma]
-        
-        # Handle both old list format and new dict format
-        if isinstance(verb_info, dict):
-            allows_np = verb_info.get('allows_np', True)
-            requires_pp = verb_info.get('requires_pp', False)
-            frames = verb_info.get('frames', [])
-        else:
-            # Old format: list of frame types
-            frames = verb_info
-            allows_np = 'transitive' in frames or 'ditransitive' in frames
-            requires_pp = 'pp_required' in frames
-        
-        # Analyze what follows the verb
-        after_verb = pos_tags[verb_idx + 1:] if verb_idx < len(pos_tags) - 1 else []
+        # Entries are normalized to the dict format at load time
+        allows_np = verb_info['allows_np']
+        requires_pp = verb_info['requires_pp']
         
-        # Determine argument structure
-        has_np = False
-        has_pp = False
+        # Determine argument structure from what follows the verb
+        n = len(pos_tags)
         
         # Check for NP immediately after verb (DT + NN, PRP, NNP, etc.)
-        if after_verb:
-            if after_verb[0] in ('DT', 'PRP', 'NNP', 'NNPS', 'CD', 'PRP$'):
-                has_np = True
-            elif after_verb[0] in ('NN', 'NNS'):
-                has_np = True
-        
-        # Check for PP (IN + NP)
-        for i, pos in enumerate(after_verb):
-            if pos == 'IN' and i + 1 < len(after_verb):
-                has_pp = True
-                break
+        has_np = verb_idx + 1 < n and pos_tags[verb_idx + 1] in OBJECT_NP_START_TAGS
+        
+        # Check for PP (IN + NP): an IN after the verb that is not the last word
+        has_pp = scan.has_pp
         
         # Validate based on allows_np and requires_pp flags
         # 
@@ -482,7 +685,7 @@ class EnglishParser:
             elif not allows_np:
                 errors.append(f"Verb '{verb_lemma}' does not take a direct object (NP)")
         
-        if requires_pp and not has_pp and not has_np and verb_idx < len(pos_tags) - 1:
+        if requires_pp and not has_pp and not has_np and verb_idx < n - 1:
             # Has something after verb but no PP at all
             errors.append(f"Verb '{verb_lemma}' requires a prepositional phrase")
         
@@ -490,37 +693,63 @@ class EnglishParser:
     
     def format_result(self, result: Dict) -> str:
         """Format parsing result for display."""
-        lines = []
-        lines.append(f"Sentence: {result['sentence']}")
-        lines.append(f"Tokens: {result.get('tokens', [])}")
-        lines.append("")
+        lines = [
+            f"Sentence: {result['sentence']}",
+            f"Tokens: {result.get('tokens', [])}",
+            "",
+        ]
         
         if result['grammatical']:
-            lines.append("✓ GRAMMATICAL")
-            lines.append(f"POS Sequence: {' '.join(result['pos_sequence'])}")
-            lines.append("")
-            lines.append("Parse Tree:")
+            lines += ("✓ GRAMMATICAL",
+                      f"POS Sequence: {' '.join(result['pos_sequence'])}",
+                      "",
+                      "Parse Tree:")
             if result['parse_trees']:
-                tree_str = self.tree_converter.format_tree(result['parse_trees'][0])
-                lines.append(tree_str)
-                lines.append("")
-                lines.append(f"Bracket: {self.tree_converter.format_tree_bracket(result['parse_trees'][0])}")
+                tree = result['parse_trees'][0]
+                lines += (self.tree_converter.format_tree(tree),
+                          "",
+                          f"Bracket: {self.tree_converter.format_tree_bracket(tree)}")
         else:
             lines.append("✗ UNGRAMMATICAL")
             if result['errors']:
                 lines.append("Errors:")
-                for error in result['errors'][:5]:  # Show first 5 errors
-                    lines.append(f"  - {error}")
+                lines += [f"  - {error}" for error in result['errors'][:5]]  # Show first 5 errors
         
         return '\n'.join(lines)
 
 
+# Parser of a worker process: set by _worker_init, or inherited from the
+# parent when workers are forked
+_worker_parser = None
+
+
+def _worker_init():
+    """Build the parser of a worker process (its startup output is discarded)."""
+    global _worker_parser
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_parser = EnglishParser(verbose=False)
+    _worker_parser.verbose = True
+
+
+def _worker_parse(sentence: str) -> Tuple[Dict[str, Any], str]:
+    """Parse a sentence in a worker process; the parent prints its verbose output."""
+    return _worker_parser.parse_logged(sentence)
+
+
 def main():
     """Main entry point."""
     
     # Initialize parser
     parser = EnglishParser(verbose=True)
     
+    def print_parses(sentences):
+        """Parse and print sentences, tagging them with spaCy in one batch."""
+        analyses = parser.preprocessor.analyze_batch(sentences)
+        for sentence, analysis in zip(sentences, analyses):
+            print("\n" + "-" * 60)
+            result = parser.parse(sentence, analysis)
+            print(parser.format_result(result))
+    
     valid_sentences = [
         "I bought a present for my friend yesterday.",
         "I enjoy historical novels.",
@@ -560,15 +789,7 @@ def main():
     print("English Parser - Test Results")
     print("=" * 70)
     
-    for sentence in valid_sentences:
-        print("\n" + "-" * 60)
-        result = parser.parse(sentence)
-        print(parser.format_result(result))
-
-    for sentence in invalid_sentences:
-        print("\n" + "-" * 60)
-        result = parser.parse(sentence)
-        print(parser.format_result(result))
+    print_parses(valid_sentences + invalid_sentences)
     
     # Interactive mode if no arguments
     if len(sys.argv) == 1:
@@ -593,11 +814,25 @@ def main():
         if sys.argv[1] == '-f' and len(sys.argv) >= 3:
             # Parse sentences from file
             with open(sys.argv[2], 'r') as f:
-                for line in f:
-                    sentence = line.strip()
-                    if sentence:
+                sentences = [line.strip() for line in f]
+            sentences = [sentence for sentence in sentences if sentence]
+            workers = os.cpu_count() or 1
+            if len(sentences) < PARALLEL_MIN_SENTENCES or workers == 1:
+                print_parses(sentences)
+            else:
+                # Forked workers share the parent's parser, spaCy model
+                # included; otherwise each worker loads its own once. They
+                # take sentences in chunks; results come back in input order
+                global _worker_parser
+                if 'fork' in multiprocessing.get_all_start_methods():
+                    _worker_parser = parser
+                    pool_options = {'mp_context': multiprocessing.get_context('fork')}
+                else:
+                    pool_options = {'initializer': _worker_init}
+                with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+                    for result, log in executor.map(_worker_parse, sentences, chunksize=16):
                         print("\n" + "-" * 60)
-                        result = parser.parse(sentence)
+                        sys.stdout.write(log)
                         print(parser.format_result(result))
         else:
             # Parse single sentence from command line
@@ -10,7 +10,10 @@ The disambiguator picks the correct POS tag based on context,
 so we don't need to try all possible combinations.
 """
 
+import functools
 import json
+import os
+import pickle
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
@@ -23,6 +26,63 @@ except ImportError:
     SPACY_AVAILABLE = False
     print("Warning: spaCy not installed. Run: pip install spacy")
 
+# orjson is optional: it speeds up parsing the JSON data files when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Pipeline components whose output is never read: only the tagger (tag_),
+# the attribute ruler (morph, and the pos_ the lemmatizer relies on) and
+# the lemmatizer are used
+UNUSED_SPACY_COMPONENTS = ('parser', 'ner')
+
+
+@functools.lru_cache(maxsize=4)
+def _load_spacy(model_name: str):
+    """Load a spaCy model once per process; later preprocessors share it."""
+    return spacy.load(model_name, exclude=UNUSED_SPACY_COMPONENTS)
+
+
+def load_json_cached(filepath) -> Any:
+    """
+    Load a JSON file, through a pickle of its contents kept next to it.
+    
+    The pickle (same name, .pkl suffix) starts with the size and mtime of
+    the JSON file it was written from, and is used while the JSON file still
+    has both; otherwise it is rewritten from the JSON. Unpickling is much
+    faster than parsing these dict-heavy files at every startup.
+    """
+    path = Path(filepath)
+    cache = path.with_suffix('.pkl')
+    stat = path.stat()
+    source = (stat.st_size, stat.st_mtime_ns)
+    try:
+        with open(cache, 'rb') as f:
+            if pickle.load(f) == source:
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # No usable cache: fall back to the JSON file
+    
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    
+    # Write the cache atomically; a read-only data directory just means no cache
+    tmp = cache.with_name(cache.name + '.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            pickle.dump(source, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+    return data
+
 
 class MorphologicalPreprocessor:
     """
@@ -31,16 +91,25 @@ class MorphologicalPreprocessor:
     
     def __init__(self, 
                  lexicon_path: str = None,
-                 spacy_model: str = "en_core_web_lg"):
+                 spacy_model: str = "en_core_web_sm",
+                 batch_size: int = 50,
+                 n_process: int = 1):
         """
         Initialize the preprocessor.
         
         Args:
             lexicon_path: Path to lexicon_with_features.json (for feature lookup)
-            spacy_model: spaCy model to use for disambiguation
+            spacy_model: spaCy model to use for disambiguation (the small
+                         model has no word vectors, which are not needed here)
+            batch_size: Default sentences per spaCy batch in analyze_batch
+            n_process: Default spaCy worker processes in analyze_batch
         """
         self.lexicon = {}
+        self._lex_index = {}  # (word, POS tag) -> first lexicon entry with that tag
+        self._morph_features = {}  # spaCy morph key -> our (feature, value) pairs
         self.nlp = None
+        self.batch_size = batch_size
+        self.n_process = n_process
         
         # Load lexicon for feature lookup
         if lexicon_path:
@@ -49,16 +118,21 @@ class MorphologicalPreprocessor:
         # Load spaCy model for disambiguation
         if SPACY_AVAILABLE:
             try:
-                self.nlp = spacy.load(spacy_model)
+                self.nlp = _load_spacy(spacy_model)
                 print(f"Loaded spaCy model: {spacy_model}")
             except OSError:
                 print(f"spaCy model '{spacy_model}' not found.")
                 print(f"Run: python -m spacy download {spacy_model}")
     
     def load_lexicon(self, filepath: str):
-        """Load the lexicon from a JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.lexicon = json.load(f)
+        """Load the lexicon from a JSON file (see load_json_cached)."""
+        self.lexicon = load_json_cached(filepath)
+        
+        # Index the entries by word and tag for O(1) lookups; reversed, so
+        # that the first entry of a tag is the one kept
+        self._lex_index = {(word, entry.get('pos')): entry
+                           for word, entries in self.lexicon.items()
+                           for entry in reversed(entries)}
         print(f"Loaded lexicon with {len(self.lexicon)} words")
     
     def analyze_sentence(self, sentence: str) -> Dict[str, Any]:
@@ -78,10 +152,44 @@ class MorphologicalPreprocessor:
             raise RuntimeError("spaCy model not loaded")
         
         # Use spaCy for tokenization and POS tagging
-        doc = self.nlp(sentence)
+        return self._analyze_doc(sentence, self.nlp(sentence))
+    
+    def analyze_batch(self, sentences: List[str], batch_size: Optional[int] = None,
+                      n_process: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze several sentences, tagging them together with nlp.pipe.
+        
+        Batches of roughly 45-85 sentences are usually the fastest for the
+        small pipeline. Worker processes only pay off on large inputs:
+        below two batches per worker, the sentences are tagged in this
+        process instead, since starting the workers would take longer.
         
+        Args:
+            sentences: Input sentence strings
+            batch_size: Sentences per spaCy batch (default: self.batch_size)
+            n_process: Worker processes for spaCy (default: self.n_process)
+            
+        Returns:
+            One analyze_sentence() result per sentence, in order
+        """
+        if self.nlp is None:
+            raise RuntimeError("spaCy model not loaded")
+        
+        if batch_size is None:
+            batch_size = self.batch_size
+        if n_process is None:
+            n_process = self.n_process
+        if n_process != 1 and len(sentences) <= batch_size * n_process * 2:
+            n_process = 1
+        docs = self.nlp.pipe(sentences, batch_size=batch_size, n_process=n_process)
+        return [self._analyze_doc(sentence, doc) for sentence, doc in zip(sentences, docs)]
+    
+    def _analyze_doc(self, sentence: str, doc) -> Dict[str, Any]:
+        """Build the analyze_sentence() result from the spaCy doc of a sentence."""
         word_analyses = []
         pos_sequence = []
+        lex_index = self._lex_index
+        morph_cache = self._morph_features
         
         for token in doc:
             # Skip punctuation
@@ -91,9 +199,6 @@ class MorphologicalPreprocessor:
             word = token.text.lower()
             pos_tag = token.tag_  # Fine-grained Penn Treebank tag
             
-            # Get morphological features from spaCy
-            morph = token.morph.to_dict()
-            
             # Build features dictionary
             features = {
                 'word': word,
@@ -101,27 +206,21 @@ class MorphologicalPreprocessor:
                 'lemma': token.lemma_,
             }
             
-            # Add number feature
-            if 'Number' in morph:
-                features['num'] = 'sg' if morph['Number'] == 'Sing' else 'pl'
-            
-            # Add person feature (for pronouns and verbs)
-            if 'Person' in morph:
-                features['person'] = morph['Person']
-            
-            # Add tense feature
-            if 'Tense' in morph:
-                features['tense'] = morph['Tense'].lower()
+            # Add the morphological features from spaCy, translated once per
+            # distinct analysis (to_dict() is the expensive part)
+            morph = token.morph
+            morph_features = morph_cache.get(morph.key)
+            if morph_features is None:
+                morph_features = morph_cache[morph.key] = self._morph_features_of(morph.to_dict())
+            features.update(morph_features)
             
             # If we have a lexicon, try to get additional features
-            if word in self.lexicon:
-                for lex_entry in self.lexicon[word]:
-                    if lex_entry.get('pos') == pos_tag:
-                        # Merge lexicon features
-                        for key, value in lex_entry.items():
-                            if key not in features:
-                                features[key] = value
-                        break
+            lex_entry = lex_index.get((word, pos_tag))
+            if lex_entry is not None:
+                # Merge lexicon features
+                for key, value in lex_entry.items():
+                    if key not in features:
+                        features[key] = value
             
             word_analyses.append({
                 'word': word,
@@ -142,6 +241,25 @@ class MorphologicalPreprocessor:
             'pos_sequences': [pos_sequence]  # Single sequence (disambiguated)
         }
     
+    @staticmethod
+    def _morph_features_of(morph: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        """Translate a spaCy morph dict into our (feature, value) pairs."""
+        features = []
+        
+        # Add number feature
+        if 'Number' in morph:
+            features.append(('num', 'sg' if morph['Number'] == 'Sing' else 'pl'))
+        
+        # Add person feature (for pronouns and verbs)
+        if 'Person' in morph:
+            features.append(('person', morph['Person']))
+        
+        # Add tense feature
+        if 'Tense' in morph:
+            features.append(('tense', morph['Tense'].lower()))
+        
+        return tuple(features)
+    
     def format_analysis(self, result: Dict) -> str:
         """Format analysis result for display."""
         lines = []
@@ -181,9 +299,8 @@ def main():
     print("Morphological Preprocessor Demo (with spaCy disambiguation)")
     print("=" * 60)
     
-    for sentence in test_sentences:
+    for result in preprocessor.analyze_batch(test_sentences):
         print("\n" + "-" * 40)
-        result = preprocessor.analyze_sentence(sentence)
         print(preprocessor.format_analysis(result))
 
 
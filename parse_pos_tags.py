@@ -8,9 +8,17 @@ Output format: {pos_tag: [word1, word2, ...]}
 """
 
 import nltk
+import sys
 from collections import defaultdict
 import json
 
+# orjson is optional: it speeds up writing the output files when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Download required NLTK data (run once)
 try:
     nltk.data.find('corpora/treebank')
@@ -21,7 +29,7 @@ except LookupError:
 # Define closed-class (function words) and open-class (content words) POS tags
 # Based on Penn Treebank tagset
 
-CLOSED_CLASS_TAGS = {
+CLOSED_CLASS_TAGS = frozenset({
     # Determiners
     'DT',    # Determiner (the, a, an)
     'PDT',   # Predeterminer (all, both)
@@ -48,9 +56,9 @@ CLOSED_CLASS_TAGS = {
     
     # Interjections and other
     'UH',    # Interjection (uh, oh)
-}
+})
 
-OPEN_CLASS_TAGS = {
+OPEN_CLASS_TAGS = frozenset({
     # Nouns
     'NN',    # Noun, singular or mass
     'NNS',   # Noun, plural
@@ -83,7 +91,26 @@ OPEN_CLASS_TAGS = {
     # Symbols (can be considered open class as they are content-bearing)
     'SYM',   # Symbol
     'LS',    # List item marker
-}
+})
+
+
+def _words_by_tag(tagged_words):
+    """
+    Group lowercased words by tag, in one pass over the tagged words.
+    
+    Returns:
+        tuple: ({tag: sorted unique words} with tags in order of first
+        occurrence, number of tagged words read)
+    """
+    # Sets for automatic uniqueness; interned, so a word filed under
+    # several tags is stored once
+    words_by_tag = defaultdict(set)
+    intern = sys.intern
+    count = 0
+    for count, (word, tag) in enumerate(tagged_words, 1):
+        # Convert word to lowercase for consistency
+        words_by_tag[tag].add(intern(word.lower()))
+    return {tag: sorted(words) for tag, words in words_by_tag.items()}, count
 
 
 def parse_penn_treebank():
@@ -96,41 +123,33 @@ def parse_penn_treebank():
     """
     from nltk.corpus import treebank
     
-    # Initialize dictionaries with sets for automatic uniqueness
-    closed_class = defaultdict(set)
-    open_class = defaultdict(set)
-    uncategorized = defaultdict(set)
+    # Stream the tagged words: the corpus view would be read a second time
+    # just to take its len()
+    words_by_tag, total = _words_by_tag(treebank.tagged_words())
     
-    # Get all tagged words from the treebank
-    tagged_words = treebank.tagged_words()
+    print(f"Total tagged words in Penn Treebank: {total}")
     
-    print(f"Total tagged words in Penn Treebank: {len(tagged_words)}")
-    
-    # Process each word-tag pair
-    for word, tag in tagged_words:
-        # Convert word to lowercase for consistency
-        word_lower = word.lower()
-        
-        if tag in CLOSED_CLASS_TAGS:
-            closed_class[tag].add(word_lower)
-        elif tag in OPEN_CLASS_TAGS:
-            open_class[tag].add(word_lower)
-        else:
-            # Punctuation and other tags go here
-            uncategorized[tag].add(word_lower)
-    
-    # Convert sets to sorted lists for JSON serialization
-    closed_class_dict = {tag: sorted(list(words)) for tag, words in closed_class.items()}
-    open_class_dict = {tag: sorted(list(words)) for tag, words in open_class.items()}
-    uncategorized_dict = {tag: sorted(list(words)) for tag, words in uncategorized.items()}
+    closed_class_dict = {}
+    open_class_dict = {}
+    uncategorized_dict = {}  # Punctuation and other tags go here
+    # Target dictionary by tag; anything not listed is uncategorized
+    bucket = dict.fromkeys(CLOSED_CLASS_TAGS, closed_class_dict)
+    bucket.update(dict.fromkeys(OPEN_CLASS_TAGS, open_class_dict))
+    for tag, words in words_by_tag.items():
+        bucket.get(tag, uncategorized_dict)[tag] = words
     
     return closed_class_dict, open_class_dict, uncategorized_dict
 
 
 def save_to_json(data, filename):
     """Save dictionary to JSON file."""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        # Same layout as json.dump below; orjson always writes UTF-8 as is
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     print(f"Saved to {filename}")
 
 
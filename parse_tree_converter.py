@@ -8,6 +8,7 @@ that were introduced during CNF conversion.
 This is the reverse operation of CNF conversion - also known as "de-binarization".
 """
 
+import re
 from typing import List, Tuple, Dict, Set, Any, Optional
 
 
@@ -15,12 +16,16 @@ class ParseTreeConverter:
     def __init__(self):
         # Set of auxiliary non-terminals to flatten/remove
         self.auxiliary_prefixes = {'Y', 'T', 'S0'}  # Default prefixes from CNF converter
+        self._aux_prefix_re = self._compile_prefixes(self.auxiliary_prefixes)
         self.auxiliary_nts = set()
         
         # Original grammar (if provided, for validation)
         self.original_grammar = None
         self.original_non_terminals = set()
         
+        # is_auxiliary() answers by symbol, cleared by the setters below
+        self._aux_cache = {}
+        
     def set_auxiliary_prefixes(self, prefixes: List[str]):
         """
         Set the prefixes used for auxiliary non-terminals.
@@ -29,6 +34,15 @@ class ParseTreeConverter:
             prefixes: List of prefixes (e.g., ['Y', 'T', 'X'])
         """
         self.auxiliary_prefixes = set(prefixes)
+        self._aux_prefix_re = self._compile_prefixes(self.auxiliary_prefixes)
+        self._aux_cache.clear()
+    
+    @staticmethod
+    def _compile_prefixes(prefixes: Set[str]) -> Optional[re.Pattern]:
+        """Regex matching a prefix followed by nothing but digits (Y, Y0, T12, ...)."""
+        if not prefixes:
+            return None
+        return re.compile('(?:' + '|'.join(map(re.escape, prefixes)) + r')\d*')
         
     def load_original_grammar(self, grammar: dict):
         """
@@ -39,6 +53,7 @@ class ParseTreeConverter:
         """
         self.original_grammar = grammar
         self.original_non_terminals = set(grammar.keys())
+        self._aux_cache.clear()
         
     def set_auxiliary_nts(self, auxiliary_nts: Set[str]):
         """
@@ -48,17 +63,29 @@ class ParseTreeConverter:
             auxiliary_nts: Set of auxiliary non-terminal names
         """
         self.auxiliary_nts = auxiliary_nts
+        self._aux_cache.clear()
         
     def is_auxiliary(self, nt: str) -> bool:
         """
         Check if a non-terminal is auxiliary (should be flattened).
         
+        The answer is cached per symbol; change the auxiliary symbols,
+        prefixes or the original grammar through the setters, which
+        clear the cache.
+        
         Args:
             nt: Non-terminal symbol
             
         Returns:
             True if auxiliary, False otherwise
         """
+        auxiliary = self._aux_cache.get(nt)
+        if auxiliary is None:
+            auxiliary = self._aux_cache[nt] = self._classify_auxiliary(nt)
+        return auxiliary
+    
+    def _classify_auxiliary(self, nt: str) -> bool:
+        """Compute is_auxiliary(nt)."""
         # If explicitly set
         if self.auxiliary_nts and nt in self.auxiliary_nts:
             return True
@@ -68,11 +95,7 @@ class ParseTreeConverter:
             return True
             
         # Check by prefix pattern (Y0, Y1, T0, T1, etc.)
-        for prefix in self.auxiliary_prefixes:
-            if nt.startswith(prefix) and (len(nt) == len(prefix) or nt[len(prefix):].isdigit()):
-                return True
-                
-        return False
+        return self._aux_prefix_re is not None and self._aux_prefix_re.fullmatch(nt) is not None
     
     def convert(self, tree: Tuple) -> Tuple:
         """
@@ -94,34 +117,41 @@ class ParseTreeConverter:
         return self._convert_node(tree)
     
     def _convert_node(self, node: Tuple) -> Tuple:
-        """Recursively convert a node and its children."""
-        if len(node) == 2 and isinstance(node[1], str):
+        """Convert a node and its children, depth-first with an explicit stack."""
+        if len(node) == 2 and type(node[1]) is str:
             # Leaf node: (NT, terminal)
             return node
+        
+        is_auxiliary = self.is_auxiliary
+        
+        # Internal nodes being converted: (NT, iterator over the children
+        # left, converted children so far)
+        stack = [(node[0], iter(node[1:]), [])]
+        while True:
+            nt, children, converted_children = stack[-1]
             
-        # Internal node: (NT, left_child, right_child)
-        nt = node[0]
-        children = list(node[1:])
-        
-        # Recursively convert children first
-        converted_children = []
-        for child in children:
-            converted_child = self._convert_node(child)
-            
-            # If the child is an auxiliary NT, flatten its children
-            if isinstance(converted_child, tuple) and len(converted_child) > 1:
-                child_nt = converted_child[0]
-                if self.is_auxiliary(child_nt):
-                    # Flatten: add the auxiliary's children directly
-                    converted_children.extend(converted_child[1:])
+            # Convert the children first; a leaf converts to itself
+            for converted_child in children:
+                if not (len(converted_child) == 2 and type(converted_child[1]) is str):
+                    stack.append((converted_child[0], iter(converted_child[1:]), []))
+                    break
+                # If the child is an auxiliary NT, flatten its children;
+                # a leaf has just the one
+                if isinstance(converted_child, tuple) and is_auxiliary(converted_child[0]):
+                    converted_children.append(converted_child[1])
                 else:
                     converted_children.append(converted_child)
             else:
-                converted_children.append(converted_child)
-        
-        # If current node is auxiliary, return just the children (will be flattened above)
-        # But if it's the root, we keep it
-        return (nt,) + tuple(converted_children)
+                # If current node is auxiliary, return just the children (will be flattened above)
+                # But if it's the root, we keep it
+                stack.pop()
+                if not stack:
+                    return (nt, *converted_children)
+                # Flatten into the parent if auxiliary (and not childless)
+                if converted_children and is_auxiliary(nt):
+                    stack[-1][2].extend(converted_children)
+                else:
+                    stack[-1][2].append((nt, *converted_children))
     
     def convert_all(self, trees: List[Tuple]) -> List[Tuple]:
         """
@@ -153,16 +183,39 @@ class ParseTreeConverter:
         if isinstance(tree, str):
             return "  " * indent + tree
             
-        if len(tree) == 2 and isinstance(tree[1], str):
+        if len(tree) == 2 and type(tree[1]) is str:
             # Leaf node: (NT, terminal) like ('NP', 'PRP')
             return "  " * indent + f"({tree[0]} {tree[1]})"
-        else:
-            # Internal node with children
-            result = "  " * indent + f"({tree[0]}\n"
-            for child in tree[1:]:
-                result += self.format_tree(child, indent + 1) + "\n"
-            result = result.rstrip() + ")"
-            return result
+        
+        # Internal nodes, one child per line. The stack holds the open nodes
+        # as (iterator over the children left, their indent, text after the
+        # node), and the output pieces are collected in one list
+        parts = ["  " * indent + f"({tree[0]}\n"]
+        append = parts.append
+        stack = [(iter(tree[1:]), indent + 1, "")]
+        while stack:
+            children, indent, suffix = stack[-1]
+            for child in children:
+                if child is None:
+                    append("\n")
+                elif isinstance(child, str):
+                    append("  " * indent + child + "\n")
+                elif len(child) == 2 and type(child[1]) is str:
+                    append("  " * indent + f"({child[0]} {child[1]})\n")
+                else:
+                    append("  " * indent + f"({child[0]}\n")
+                    stack.append((iter(child[1:]), indent + 1, "\n"))
+                    break
+            else:
+                # All children done: strip trailing whitespace back into the
+                # node's own text and close it
+                stack.pop()
+                last = parts.pop().rstrip()
+                while not last:
+                    last = parts.pop().rstrip()
+                append(last + ")" + suffix)
+        
+        return "".join(parts)
     
     def format_tree_bracket(self, tree: Tuple) -> str:
         """
@@ -181,19 +234,48 @@ class ParseTreeConverter:
         if isinstance(tree, str):
             return tree
             
-        if len(tree) == 2 and isinstance(tree[1], str):
+        if len(tree) == 2 and type(tree[1]) is str:
             return f"({tree[0]} {tree[1]})"
-        else:
-            children = " ".join(self.format_tree_bracket(child) for child in tree[1:])
-            return f"({tree[0]} {children})"
+        if len(tree) == 1:
+            return f"({tree[0]} )"
+        
+        # Internal nodes: the stack holds an iterator over the children left
+        # of every open node, and each child's text, preceded by its
+        # separator, goes to one list of pieces
+        parts = [f"({tree[0]}"]
+        append = parts.append
+        stack = [iter(tree[1:])]
+        while stack:
+            for child in stack[-1]:
+                if child is None:
+                    append(" ")
+                elif isinstance(child, str):
+                    append(" " + child)
+                elif len(child) == 2 and type(child[1]) is str:
+                    append(f" ({child[0]} {child[1]})")
+                elif len(child) == 1:
+                    append(f" ({child[0]} )")
+                else:
+                    append(f" ({child[0]}")
+                    stack.append(iter(child[1:]))
+                    break
+            else:
+                stack.pop()
+                append(")")
+        
+        return "".join(parts)
     
     def get_tree_depth(self, tree: Tuple) -> int:
         """Calculate the depth of a parse tree."""
-        if tree is None:
-            return 0
-        if len(tree) == 2 and isinstance(tree[1], str):
-            return 1
-        return 1 + max(self.get_tree_depth(child) for child in tree[1:])
+        # Count the levels, breadth-first; empty subtrees add nothing
+        depth = 0
+        level = [tree] if tree is not None else []
+        while level:
+            depth += 1
+            level = [child for node in level
+                     if not (len(node) == 2 and type(node[1]) is str)
+                     for child in node[1:] if child is not None]
+        return depth
     
     def count_nodes(self, tree: Tuple) -> Dict[str, int]:
         """
@@ -202,19 +284,18 @@ class ParseTreeConverter:
         Returns:
             Dictionary with 'total', 'internal', 'leaf' counts
         """
-        if tree is None:
-            return {'total': 0, 'internal': 0, 'leaf': 0}
-            
-        if len(tree) == 2 and isinstance(tree[1], str):
-            return {'total': 1, 'internal': 0, 'leaf': 1}
-            
-        counts = {'total': 1, 'internal': 1, 'leaf': 0}
-        for child in tree[1:]:
-            child_counts = self.count_nodes(child)
-            counts['total'] += child_counts['total']
-            counts['internal'] += child_counts['internal']
-            counts['leaf'] += child_counts['leaf']
-        return counts
+        internal = leaf = 0
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if len(node) == 2 and type(node[1]) is str:
+                leaf += 1
+            else:
+                internal += 1
+                stack.extend(node[1:])
+        return {'total': internal + leaf, 'internal': internal, 'leaf': leaf}
     
     def extract_constituents(self, tree: Tuple, sentence: List[str] = None) -> List[Tuple[str, int, int, str]]:
         """
@@ -229,12 +310,16 @@ class ParseTreeConverter:
         """
         constituents = []
         self._extract_constituents_helper(tree, 0, constituents, sentence)
-        return constituents
+        # The helper leaves the text of internal nodes out (None); their
+        # span text is joined from the sentence once here
+        return [(label, start, end,
+                 text if text is not None else " ".join(sentence[start:end]) if sentence else "")
+                for label, start, end, text in constituents]
     
     def _extract_constituents_helper(self, node: Tuple, start: int, 
                                       constituents: List, sentence: List[str] = None) -> int:
-        """Helper for constituent extraction."""
-        if len(node) == 2 and isinstance(node[1], str):
+        """Helper for constituent extraction; returns the end of the node's span."""
+        if len(node) == 2 and type(node[1]) is str:
             # Leaf node
             end = start + 1
             text = sentence[start] if sentence and start < len(sentence) else node[1]
@@ -242,18 +327,12 @@ class ParseTreeConverter:
             return end
             
         # Internal node
-        current_pos = start
-        child_texts = []
-        
+        end = start
         for child in node[1:]:
-            end_pos = self._extract_constituents_helper(child, current_pos, constituents, sentence)
-            if sentence:
-                child_texts.extend(sentence[current_pos:end_pos])
-            current_pos = end_pos
-        
-        text = " ".join(child_texts) if child_texts else ""
-        constituents.append((node[0], start, current_pos, text))
-        return current_pos
+            end = self._extract_constituents_helper(child, end, constituents, sentence)
+        
+        constituents.append((node[0], start, end, None))
+        return end
 
 
 def main():
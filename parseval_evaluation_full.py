@@ -7,6 +7,9 @@ from collections import namedtuple
 from main import EnglishParser
 
 Constituent = namedtuple('Constituent', ['label', 'start', 'end'])
+# Builds a Constituent from a (label, start, end) tuple; about a third
+# cheaper than calling the class, whose __new__ is Python code
+_make_constituent = Constituent._make
 
 # Gold standard parse trees
 GOLD_PARSES = {
@@ -44,22 +47,23 @@ GOLD_PARSES = {
     "I have less apples than you.": "(S (NP (PRP I)) (VP (VBP have) (NP (NP (JJR less) (NNS apples)) (PP (IN than) (NP (PRP you))))) )"
 }
 # POS tags (terminals)
-POS_TAGS = {'CC', 'CD', 'DT', 'EX', 'FW', 'IN', 'JJ', 'JJR', 'JJS', 'LS', 'MD',
-            'NN', 'NNS', 'NNP', 'NNPS', 'PDT', 'POS', 'PRP', 'PRP$', 'RB', 'RBR',
-            'RBS', 'RP', 'SYM', 'TO', 'UH', 'VB', 'VBD', 'VBG', 'VBN', 'VBP',
-            'VBZ', 'WDT', 'WP', 'WP$', 'WRB', '.', ',', ':', "''", '``', '-LRB-', '-RRB-'}
+POS_TAGS = frozenset({'CC', 'CD', 'DT', 'EX', 'FW', 'IN', 'JJ', 'JJR', 'JJS', 'LS', 'MD',
+                      'NN', 'NNS', 'NNP', 'NNPS', 'PDT', 'POS', 'PRP', 'PRP$', 'RB', 'RBR',
+                      'RBS', 'RP', 'SYM', 'TO', 'UH', 'VB', 'VBD', 'VBG', 'VBN', 'VBP',
+                      'VBZ', 'WDT', 'WP', 'WP$', 'WRB', '.', ',', ':', "''", '``', '-LRB-', '-RRB-'})
+# Punctuation tags, never counted as constituents
+PUNCT_TAGS = frozenset({'.', ',', ':', "''", '``', '-LRB-', '-RRB-'})
+# Labels skipped in parser trees: POS tag nodes and punctuation
+_SKIP_LABELS = POS_TAGS | PUNCT_TAGS
 
 
 def extract_constituents_from_tuple(tree, include_root=False):
     """Extract constituents from parser's tuple format: ('S', ('NP', 'DT', 'NN'), ('VP', ...))"""
     constituents = set()
 
-    def is_terminal(node):
-        """Check if node is a terminal (POS tag string)."""
-        return isinstance(node, str)
-
     def traverse(node, pos):
-        if is_terminal(node):
+        # A terminal (POS tag string) takes one position
+        if type(node) is str:
             return pos + 1
 
         label = node[0]
@@ -71,22 +75,21 @@ def extract_constituents_from_tuple(tree, include_root=False):
         end = pos
 
         # Skip POS tag nodes (label is in POS_TAGS) and punctuation
-        is_pos_tag = label in POS_TAGS
-        is_punct = label in ('.', ',', ':', "''", '``', '-LRB-', '-RRB-')
-
-        if not is_pos_tag and not is_punct:
+        if label not in _SKIP_LABELS:
             # Normalize S0 -> S
             normalized_label = 'S' if label == 'S0' else label
-            constituents.add(Constituent(normalized_label, start, end))
+            constituents.add(_make_constituent((normalized_label, start, end)))
 
         return end
 
-    traverse(tree, 0)
+    root_end = traverse(tree, 0)
 
-    # Remove root if needed
+    # Remove root if needed: it spans the whole sentence, unless the root
+    # node itself was skipped (then the widest span kept is removed)
     if not include_root and constituents:
-        max_end = max(c.end for c in constituents)
-        constituents = {c for c in constituents if not (c.start == 0 and c.end == max_end)}
+        if tree[0] in _SKIP_LABELS:
+            root_end = max(c.end for c in constituents)
+        constituents = {c for c in constituents if not (c.start == 0 and c.end == root_end)}
 
     return constituents
 
@@ -94,46 +97,39 @@ def extract_constituents_from_tuple(tree, include_root=False):
 def parse_gold_tree(tree_str):
     """Parse gold standard bracket notation: (S (NP (DT The) (NN dog)) ...)"""
     tokens = tree_str.replace('(', ' ( ').replace(')', ' ) ').split()
-    tokens = [t for t in tokens if t]
-    idx = 0
-
-    def parse_node():
-        nonlocal idx
-        if tokens[idx] != '(':
-            raise ValueError(f"Expected '(' at {idx}")
-        idx += 1
-        label = tokens[idx]
-        idx += 1
-        children = []
-
-        while tokens[idx] != ')':
-            if tokens[idx] == '(':
-                children.append(parse_node())
-            else:
-                children.append(tokens[idx])  # word
-                idx += 1
-        idx += 1
-
-        return (label,) + tuple(children)
+    if tokens[0] != '(':
+        raise ValueError("Expected '(' at 0")
 
-    return parse_node()
+    # Open nodes as lists of their label and the children read so far;
+    # a node becomes a tuple when it closes
+    stack = []
+    idx = 0
+    while True:
+        token = tokens[idx]
+        if token == '(':
+            stack.append([tokens[idx + 1]])  # label
+            idx += 2
+        elif token == ')':
+            idx += 1
+            node = tuple(stack.pop())
+            if not stack:
+                return node
+            stack[-1].append(node)
+        else:
+            stack[-1].append(token)  # word
+            idx += 1
 
 
 def extract_constituents_from_gold(tree, include_root=False):
     """Extract constituents from gold tree tuple."""
     constituents = set()
 
-    def is_preterminal(node):
-        """A preterminal has exactly one child which is a string (the word)."""
-        if not isinstance(node, tuple) or len(node) != 2:
-            return False
-        return isinstance(node[1], str)
-
     def traverse(node, pos):
-        if isinstance(node, str):
+        if type(node) is str:
             return pos + 1
 
-        if is_preterminal(node):
+        # A preterminal has exactly one child which is a string (the word)
+        if type(node) is tuple and len(node) == 2 and type(node[1]) is str:
             return pos + 1
 
         label = node[0]
@@ -144,17 +140,19 @@ def extract_constituents_from_gold(tree, include_root=False):
             pos = traverse(child, pos)
         end = pos
 
-        is_punct = label in ('.', ',', ':', "''", '``', '-LRB-', '-RRB-')
-        if not is_punct:
-            constituents.add(Constituent(label, start, end))
+        if label not in PUNCT_TAGS:
+            constituents.add(_make_constituent((label, start, end)))
 
         return end
 
-    traverse(tree, 0)
+    root_end = traverse(tree, 0)
 
+    # The root spans the whole sentence, unless it is punctuation and was
+    # skipped (then the widest span kept is removed)
     if not include_root and constituents:
-        max_end = max(c.end for c in constituents)
-        constituents = {c for c in constituents if not (c.start == 0 and c.end == max_end)}
+        if tree[0] in PUNCT_TAGS:
+            root_end = max(c.end for c in constituents)
+        constituents = {c for c in constituents if not (c.start == 0 and c.end == root_end)}
 
     return constituents
 
@@ -164,30 +162,40 @@ def tuple_to_bracket(tree):
     if isinstance(tree, str):
         return tree
 
-    label = tree[0]
-    children = tree[1:]
-
-    # Build bracket notation recursively
-    parts = [f"({label}"]
-    for child in children:
-        parts.append(" " + tuple_to_bracket(child))
-    parts.append(")")
+    # Build bracket notation depth-first into one list of pieces; the stack
+    # holds an iterator over the children left of every open node
+    parts = [f"({tree[0]}"]
+    append = parts.append
+    stack = [iter(tree[1:])]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, str):
+                append(" " + child)
+            else:
+                append(f" ({child[0]}")
+                stack.append(iter(child[1:]))
+                break
+        else:
+            stack.pop()
+            append(")")
 
     return "".join(parts)
 
 
 def evaluate(gold_const, system_const):
     """Calculate precision, recall, F1."""
-    matches = gold_const & system_const
-    precision = len(matches) / len(system_const) if system_const else 0
-    recall = len(matches) / len(gold_const) if gold_const else 0
+    # Nothing can match when either side is empty (& itself already walks
+    # the smaller of the two sets)
+    matches = len(gold_const & system_const) if gold_const and system_const else 0
+    precision = matches / len(system_const) if system_const else 0
+    recall = matches / len(gold_const) if gold_const else 0
     f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0
 
     return {
         'precision': precision,
         'recall': recall,
         'f1': f1,
-        'matches': len(matches),
+        'matches': matches,
         'gold': len(gold_const),
         'system': len(system_const),
         'missing': gold_const - system_const,
@@ -195,6 +203,12 @@ def evaluate(gold_const, system_const):
     }
 
 
+# The gold parses as trees, and their constituents, parsed once at import
+GOLD_TREES = {sentence: parse_gold_tree(tree_str) for sentence, tree_str in GOLD_PARSES.items()}
+GOLD_CONSTS = {sentence: frozenset(extract_constituents_from_gold(tree))
+               for sentence, tree in GOLD_TREES.items()}
+
+
 def main():
     print("Initializing parser...")
     parser = EnglishParser(verbose=False)
@@ -217,8 +231,7 @@ def main():
             continue
 
         # Get constituents from gold standard
-        gold_tree = parse_gold_tree(gold_parse_str)
-        gold_const = extract_constituents_from_gold(gold_tree)
+        gold_const = GOLD_CONSTS[sentence]
 
         # Evaluate all parse trees and pick the best one
         best_metrics = None
@@ -226,16 +239,31 @@ def main():
         best_tree_str = None
         for candidate_tree in result['parse_trees']:
             candidate_const = extract_constituents_from_tuple(candidate_tree)
+            # F1 is at most 2*min(gold, system) / (gold + system): skip trees
+            # that cannot reach the best one (ties still need the tie-breaker)
+            if best_metrics is not None and gold_const and candidate_const:
+                max_f1 = 2 * min(len(gold_const), len(candidate_const)) / (len(gold_const) + len(candidate_const))
+                if max_f1 < best_metrics['f1'] - 1e-9:
+                    continue
             candidate_metrics = evaluate(gold_const, candidate_const)
-            candidate_tree_str = tuple_to_bracket(candidate_tree)
-            # Use tree string as tie-breaker for deterministic results
-            if best_metrics is None or candidate_metrics['f1'] > best_metrics['f1'] or \
-               (candidate_metrics['f1'] == best_metrics['f1'] and candidate_tree_str < best_tree_str):
-                best_metrics = candidate_metrics
-                best_tree = candidate_tree
-                best_tree_str = candidate_tree_str
+            candidate_tree_str = None
+            if best_metrics is not None:
+                if candidate_metrics['f1'] < best_metrics['f1']:
+                    continue
+                if candidate_metrics['f1'] == best_metrics['f1']:
+                    # Use tree string as tie-breaker for deterministic results;
+                    # trees are only serialized once they tie
+                    if best_tree_str is None:
+                        best_tree_str = tuple_to_bracket(best_tree)
+                    candidate_tree_str = tuple_to_bracket(candidate_tree)
+                    if candidate_tree_str >= best_tree_str:
+                        continue
+            best_metrics = candidate_metrics
+            best_tree = candidate_tree
+            best_tree_str = candidate_tree_str
 
         system_tree = best_tree
+        system_tree_str = best_tree_str if best_tree_str is not None else tuple_to_bracket(system_tree)
         metrics = best_metrics
         results.append((sentence, metrics))
 
@@ -247,7 +275,7 @@ def main():
         status = "OK" if metrics['f1'] == 1.0 else f"F1={metrics['f1']:.2f}"
         print(f"\n[{status}] {sentence}")
         print(f"  Gold parse:   {gold_parse_str}")
-        print(f"  System parse: {tuple_to_bracket(system_tree)}")
+        print(f"  System parse: {system_tree_str}")
         print(f"  P={metrics['precision']:.2f} R={metrics['recall']:.2f} F1={metrics['f1']:.2f}")
         print(f"  Matches: {metrics['matches']}/{metrics['gold']} gold, {metrics['matches']}/{metrics['system']} system")
 
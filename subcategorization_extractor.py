@@ -12,11 +12,22 @@ VerbNet provides:
 Output is used by the parser to validate verb-argument structures.
 """
 
+import functools
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Set, Optional
 
+# orjson is optional: it speeds up writing the output file when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # NLTK VerbNet
 import nltk
 try:
@@ -28,17 +39,47 @@ except LookupError:
 
 # spaCy for lemmatization
 import spacy
-nlp = spacy.load('en_core_web_lg')
+
+# Below this many verb lemmas the VerbNet lookups run in this process:
+# starting the worker processes would take longer than the lookups
+PARALLEL_MIN_LEMMAS = 200
+
+
+@functools.lru_cache(maxsize=None)
+def _load_nlp():
+    """Load the spaCy model on first use, so importing this module stays cheap."""
+    # The parser and NER play no part in lemmatization
+    return spacy.load('en_core_web_lg', exclude=['parser', 'ner'])
 
 
 def get_lemma(word: str) -> str:
     """Get the lemma (base form) of a word using spaCy."""
-    doc = nlp(word)
+    doc = _load_nlp()(word)
     if doc:
         return doc[0].lemma_.lower()
     return word.lower()
 
 
+def get_lemmas(words: List[str]) -> List[str]:
+    """get_lemma() for each word, running them through spaCy in batches."""
+    if not words:
+        return []  # Don't load the model for nothing
+    return [doc[0].lemma_.lower() if doc else word.lower()
+            for word, doc in zip(words, _load_nlp().pipe(words, batch_size=1000))]
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_classids(verb_lemma: str) -> tuple:
+    """verbnet.classids() of a lemma, read from VerbNet once."""
+    return tuple(verbnet.classids(verb_lemma))
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_frames(classid: str) -> tuple:
+    """verbnet.frames() of a class, read from VerbNet once (many verbs share a class)."""
+    return tuple(verbnet.frames(classid))
+
+
 def analyze_frame_syntax(frame: Dict) -> Dict:
     """
     Analyze VerbNet frame syntax to determine what arguments are allowed.
@@ -51,9 +92,6 @@ def analyze_frame_syntax(frame: Dict) -> Dict:
     syntax = frame.get('syntax', [])
     pos_sequence = [s.get('pos_tag', '') for s in syntax]
     
-    description = frame.get('description', {})
-    primary = description.get('primary', '')
-    
     result = {
         'allows_np': False,
         'requires_pp': False,
@@ -62,39 +100,39 @@ def analyze_frame_syntax(frame: Dict) -> Dict:
     }
     
     # Find verb position
-    verb_idx = -1
-    for i, pos in enumerate(pos_sequence):
-        if pos == 'VERB':
-            verb_idx = i
-            break
-    
-    if verb_idx == -1:
+    try:
+        verb_idx = pos_sequence.index('VERB')
+    except ValueError:
         return result
     
     # What follows the verb?
-    after_verb = pos_sequence[verb_idx + 1:]
-    
-    # Check patterns
-    if not after_verb:
+    if verb_idx + 1 == len(pos_sequence):
         result['allows_bare'] = True
         return result
+    next_pos = pos_sequence[verb_idx + 1]
     
     # NP immediately after verb = transitive
-    if after_verb and after_verb[0] == 'NP':
+    if next_pos == 'NP':
         result['allows_np'] = True
     
     # PREP immediately after verb = PP required (intransitive with PP)
-    if after_verb and after_verb[0] == 'PREP':
+    elif next_pos == 'PREP':
         result['requires_pp'] = True
         result['allows_bare'] = True  # Usually these verbs also allow bare form
     
     # ADJ after verb = copular
-    if after_verb and after_verb[0] == 'ADJ':
+    elif next_pos == 'ADJ':
         result['allows_np'] = True  # Copular verbs are flexible
     
     return result
 
 
+# Frame types found for a verb, collected as bits of one int
+TRANSITIVE, INTRANSITIVE, DITRANSITIVE = 1, 2, 4
+FRAME_NAMES = ((TRANSITIVE, 'transitive'), (INTRANSITIVE, 'intransitive'),
+               (DITRANSITIVE, 'ditransitive'))
+
+
 def get_verbnet_frames(verb_lemma: str) -> Dict:
     """
     Get subcategorization info for a verb from VerbNet.
@@ -106,43 +144,48 @@ def get_verbnet_frames(verb_lemma: str) -> Dict:
     - allows_np: True if verb has any transitive frame (NP VERB NP)
     - requires_pp: True ONLY if verb has PP frames but NO transitive frames
     """
+    frame_bits = 0
     result = {
-        'frames': set(),
         'allows_np': False,
         'has_pp_frame': False,  # Track if any PP frame exists
         'allows_bare': False
     }
     
     try:
-        classids = verbnet.classids(verb_lemma)
+        classids = _cached_classids(verb_lemma)
+        ditransitive = False
         
         for classid in classids:
-            vn_frames = verbnet.frames(classid)
+            vn_frames = _cached_frames(classid)
             
             for frame in vn_frames:
                 analysis = analyze_frame_syntax(frame)
                 
                 if analysis['allows_np']:
                     result['allows_np'] = True
-                    result['frames'].add('transitive')
+                    frame_bits |= TRANSITIVE
                 
                 if analysis['requires_pp']:
                     result['has_pp_frame'] = True
-                    result['frames'].add('intransitive')
+                    frame_bits |= INTRANSITIVE
                 
                 if analysis['allows_bare']:
                     result['allows_bare'] = True
-                    result['frames'].add('intransitive')
-        
-        # Check for ditransitive (two NPs after verb)
-        for classid in classids:
+                    frame_bits |= INTRANSITIVE
+            
+            # Check for ditransitive (two NPs after verb)
             class_name = classid.lower()
             if 'give' in class_name or 'send' in class_name:
-                result['frames'].add('ditransitive')
+                ditransitive = True
+        
+        if ditransitive:
+            frame_bits |= DITRANSITIVE
     
     except Exception as e:
         pass
     
+    result['frames'] = {name for bit, name in FRAME_NAMES if frame_bits & bit}
+    
     # KEY: requires_pp only TRUE if verb has PP frames but NO transitive frames
     # e.g., "go" requires PP (no transitive), but "read" doesn't (has transitive)
     result['requires_pp'] = result['has_pp_frame'] and not result['allows_np']
@@ -153,6 +196,24 @@ def get_verbnet_frames(verb_lemma: str) -> Dict:
     return result
 
 
+def get_verbnet_frames_all(verb_lemmas: List[str]) -> List[Dict]:
+    """
+    get_verbnet_frames() for each lemma, in order.
+    
+    The lookups are independent, so a long list is spread over one worker
+    process per CPU. The workers are forked, so they start with this
+    process's VerbNet reader and frame caches; where fork is unavailable
+    the lookups stay serial rather than re-import this module per worker.
+    """
+    workers = os.cpu_count() or 1
+    if (workers == 1 or len(verb_lemmas) < PARALLEL_MIN_LEMMAS
+            or 'fork' not in multiprocessing.get_all_start_methods()):
+        return [get_verbnet_frames(lemma) for lemma in verb_lemmas]
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('fork')) as executor:
+        return list(executor.map(get_verbnet_frames, verb_lemmas, chunksize=16))
+
+
 def extract_subcategorization_from_lexicon(
     lexicon_path: str,
     output_path: str
@@ -178,10 +239,16 @@ def extract_subcategorization_from_lexicon(
     verb_tags = {'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ'}
     verb_lemmas = set()
     
+    # Lemmatize the verbs that have no lemma in the lexicon all at once
+    unlemmatized = [word for word, entries in lexicon.items()
+                    if any(entry.get('pos') in verb_tags and 'lemma' not in entry
+                           for entry in entries)]
+    lemmas = dict(zip(unlemmatized, get_lemmas(unlemmatized)))
+    
     for word, entries in lexicon.items():
         for entry in entries:
             if entry.get('pos') in verb_tags:
-                lemma = entry.get('lemma', get_lemma(word))
+                lemma = entry['lemma'] if 'lemma' in entry else lemmas[word]
                 verb_lemmas.add(lemma)
     
     print(f"Found {len(verb_lemmas)} unique verb lemmas")
@@ -205,8 +272,8 @@ def extract_subcategorization_from_lexicon(
     found_count = 0
     not_found = []
     
-    for lemma in sorted(verb_lemmas):
-        vn_result = get_verbnet_frames(lemma)
+    sorted_lemmas = sorted(verb_lemmas)
+    for lemma, vn_result in zip(sorted_lemmas, get_verbnet_frames_all(sorted_lemmas)):
         frames = vn_result['frames']
         
         if frames:
@@ -249,26 +316,30 @@ def extract_subcategorization_from_lexicon(
     }
     
     motion_override_count = 0
-    for lemma in MOTION_VERBS:
-        if lemma in subcat['verbs']:
-            subcat['verbs'][lemma]['allows_np'] = False
-            subcat['verbs'][lemma]['requires_pp'] = True
-            motion_override_count += 1
+    for lemma in MOTION_VERBS & subcat['verbs'].keys():
+        subcat['verbs'][lemma]['allows_np'] = False
+        subcat['verbs'][lemma]['requires_pp'] = True
+        motion_override_count += 1
     
     # Verbs requiring PP (not motion, but similar pattern)
     PP_VERBS = {'listen', 'smile', 'laugh', 'look', 'stare', 'glance'}
     
-    for lemma in PP_VERBS:
-        if lemma in subcat['verbs']:
-            subcat['verbs'][lemma]['allows_np'] = False
-            subcat['verbs'][lemma]['requires_pp'] = True
-            motion_override_count += 1
+    for lemma in PP_VERBS & subcat['verbs'].keys():
+        subcat['verbs'][lemma]['allows_np'] = False
+        subcat['verbs'][lemma]['requires_pp'] = True
+        motion_override_count += 1
     
     print(f"Applied motion verb overrides to {motion_override_count} verbs")
     
     # Save
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(subcat, f, indent=2, sort_keys=True)
+    if ORJSON_AVAILABLE:
+        # Same layout as json.dump below (any non-ASCII lemma is written as
+        # UTF-8 rather than a \u escape; both read back the same)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(subcat, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(subcat, f, indent=2, sort_keys=True)
     
     print(f"\nSaved subcategorization for {len(subcat['verbs'])} verbs to {output_path}")
     